@@ -1,4 +1,5 @@
 import asyncio
+import os
 from functools import wraps
 from typing import List, Optional
 
@@ -6,12 +7,20 @@ import typer
 from typer import Argument, Option, Typer
 
 from hanapy.cli.utils import get_player, get_variant, setup_debug
+from hanapy.core.timing import HistogramSink
 from hanapy.players.console.player import ConsolePlayerActor, print_player_view_callback, wait_input_callback
 from hanapy.players.scripted import ScriptedGameConfig
+from hanapy.runtime.archive import simulate_to_archive
 from hanapy.runtime.asyncio import AsyncClient, AsyncServer
 from hanapy.runtime.base import DEFAULT_HOST, DEFAULT_PORT
+from hanapy.runtime.bench import BenchReport, compare, get_regressions, run_benchmarks
 from hanapy.runtime.buffers import EventWaitAborted
+from hanapy.runtime.logs import StreamingLogSink, get_log_format
 from hanapy.runtime.players import ClientPlayerProxy
+from hanapy.runtime.simulation import SimulationStats, simulate
+from hanapy.runtime.tournament import Tournament, get_matchups
+from hanapy.runtime.wire import JSON, MSGPACK
+from hanapy.utils.ser import dumps
 
 app = Typer(pretty_exceptions_enable=False)
 
@@ -40,6 +49,11 @@ async def play(
     seed: Optional[int] = Option(None, "-s", "--seed"),
     auto_start_players: Optional[int] = Option(None, "-a", "--autostart"),
     log: Optional[str] = Option(None, "-l", "--log"),
+    wire_format: str = Option(MSGPACK, "--wire-format", help="Preferred wire format, json is the fallback"),
+    delta_updates: bool = Option(
+        True, "--delta-updates/--full-updates", help="Keep view replica, receive updates only"
+    ),
+    resync_every: int = Option(0, help="Server sends full view every n delta updates, 0 only on checksum mismatch"),
 ):
     await setup_debug(debug)
     game_variant = get_variant(variant)
@@ -47,9 +61,10 @@ async def play(
 
     if serve:
         server = AsyncServer(host, port)
+        server.resync_every = resync_every
         await server.start(name, game_variant, random_seed=seed, log_file=log)
 
-    client = AsyncClient(host, port)
+    client = AsyncClient(host, port, wire_formats=list(dict.fromkeys([wire_format, JSON])), delta_updates=delta_updates)
     client.add_event_handlers(player.get_event_handlers())
     player_proxy = ClientPlayerProxy(name, client, player)
 
@@ -90,6 +105,9 @@ async def play_local(
     pause: bool = Option(False),
     log: Optional[str] = Option(None, "-l", "--log"),
     log_as_script: bool = Option(False, "--as-script"),
+    compact_logs: bool = Option(False, "--compact-logs"),
+    log_checkpoint_every: int = Option(0, "--log-checkpoint-every"),
+    timing: bool = Option(False, "--timing"),
 ):
     await setup_debug(debug)
     game_variant = get_variant(variant)
@@ -99,13 +117,123 @@ async def play_local(
 
     game = game_variant(player_actors, seed)
     loop = game.get_loop()
+    if compact_logs:
+        loop.use_compact_logs(log_checkpoint_every)
+    sink = HistogramSink()
+    if timing:
+        loop.use_timing(sink)
+    # .jsonl and .msgpack logs are written turn by turn while the game is played
+    log_sink: Optional[StreamingLogSink] = None
+    if log is not None and not log_as_script and get_log_format(log) is not None:
+        log_sink = StreamingLogSink(log)
+        loop.add_log_sink(log_sink)
 
-    await loop.run(
-        turn_begin_callback=print_player_view_callback if pause else None,
-        turn_end_callback=wait_input_callback if pause else None,
-    )
-    if log is not None:
+    try:
+        await loop.run(
+            turn_begin_callback=print_player_view_callback if pause else None,
+            turn_end_callback=wait_input_callback if pause else None,
+        )
+    finally:
+        if log_sink is not None:
+            log_sink.close()
+    if log is not None and log_sink is None:
         loop.save_logs(log, log_as_script, variant, seed, players)
+    if timing:
+        print(sink.summary())
+
+
+@app.command("simulate")
+def simulate_games(
+    variant: str = Option("classic"),
+    players: List[str] = Option(..., "-p", "--player"),  # noqa: B008
+    games: int = Option(100, "-n", "--games"),
+    seed: int = Option(0, "-s", "--seed"),
+    workers: int = Option(os.cpu_count() or 1, "-w", "--workers"),
+    quiet: bool = Option(False, "-q", "--quiet"),
+    archive: Optional[str] = Option(None, "--archive", help="Also write turns of all games to this archive"),
+):
+    get_variant(variant)
+    if len(players) < 2:
+        raise typer.BadParameter("Should be at least 2 players")
+    if "console" in players:
+        raise typer.BadParameter("Console players can't be simulated")
+    for p in players:
+        get_player(p)
+
+    stats = SimulationStats()
+    seeds = range(seed, seed + games)
+    if archive is not None:
+        results = simulate_to_archive(archive, variant, players, seeds, workers=workers)
+    else:
+        results = simulate(variant, players, seeds, workers=workers)
+    for result in results:
+        stats.add(result.result)
+        if not quiet:
+            print(dumps(result).decode())
+    print(stats)
+
+
+@app.command("tournament")
+def tournament(
+    variants: List[str] = Option(["classic"], "-v", "--variant"),  # noqa: B008
+    players: List[str] = Option(..., "-p", "--player"),  # noqa: B008
+    player_counts: List[int] = Option([2], "-c", "--players"),  # noqa: B008
+    games: int = Option(100, "-n", "--games"),
+    seed: int = Option(0, "-s", "--seed"),
+    workers: int = Option(os.cpu_count() or 1, "-w", "--workers"),
+    checkpoint: Optional[str] = Option(None, "--checkpoint"),
+):
+    for variant in variants:
+        get_variant(variant)
+    for p in players:
+        if p == "console":
+            raise typer.BadParameter("Console players can't be simulated")
+        get_player(p)
+
+    matchups = get_matchups(variants, players, player_counts)
+    runner = Tournament(matchups, range(seed, seed + games), checkpoint=checkpoint)
+    runner.run(workers=workers)
+    print(runner.get_table())
+
+
+@app.command("bench")
+def bench(
+    variant: str = Option("classic"),
+    players: List[str] = Option(["rank_conv", "simple"], "-p", "--player"),  # noqa: B008
+    player_count: int = Option(2, "--players"),
+    min_time: float = Option(1.0, "--min-time"),
+    only: Optional[str] = Option(None, "-k", "--only"),
+    output: Optional[str] = Option(None, "-o", "--output"),
+    baseline: Optional[str] = Option(None, "-b", "--baseline"),
+    tolerance: float = Option(0.1, "--tolerance"),
+):
+    get_variant(variant)
+    for p in players:
+        if p == "console":
+            raise typer.BadParameter("Console players can't be benchmarked")
+        get_player(p)
+
+    report = run_benchmarks(
+        variant,
+        players,
+        player_count,
+        min_time,
+        only,
+        callback=lambda r: print(f"{r.name:<40} {r.rate:>12.1f} {r.unit}"),
+    )
+    if output is not None:
+        with open(output, "wb") as f:
+            f.write(report.to_json())
+    if baseline is None:
+        return
+    with open(baseline, "rb") as f:
+        comparisons = compare(report, BenchReport.from_json(f.read()))
+    for c in comparisons:
+        print(f"{c.name:<40} {c.baseline:>12.1f} -> {c.current:>12.1f} {c.change:+.1%}")
+    regressions = get_regressions(comparisons, tolerance)
+    if regressions:
+        print(f"Regressions over {tolerance:.0%}: {[r.name for r in regressions]}")
+        raise typer.Exit(1)
 
 
 def main():
@@ -1,5 +1,7 @@
+import os
 from typing import Dict
 
+from hanapy.contrib.bots.ismcts import ISMCTSBotPlayer
 from hanapy.contrib.bots.ranking_conventions.bot import RankingConventionsBotPlayer
 from hanapy.contrib.bots.simple import SimpleBotPlayer
 from hanapy.core.player import Bot
@@ -11,4 +13,8 @@ BOTS: Dict[str, Bot] = {
     "simple_log": SimpleBotPlayer.bot(log=True),
     "rank_conv": RankingConventionsBotPlayer.bot(log=False),
     "rank_conv_log": RankingConventionsBotPlayer.bot(log=True),
+    "ismcts": ISMCTSBotPlayer.bot(iterations=200),
+    "ismcts_1s": ISMCTSBotPlayer.bot(iterations=None, time_budget=1.0),
+    # seats share one process pool, don't use it with simulate or tournament, they run games in processes already
+    "ismcts_1s_mp": ISMCTSBotPlayer.bot(iterations=None, time_budget=1.0, workers=os.cpu_count() or 1),
 }
@@ -0,0 +1,199 @@
+import random
+from typing import Dict, List, Optional, Tuple
+
+from hanapy.core.action import Action, ClueAction, DiscardAction, PlayAction
+from hanapy.core.card import Clue
+from hanapy.core.player import PlayerView
+from hanapy.core.sampler import HandSampler
+from hanapy.core.state import GameData
+
+# (played per color, hands as sorted card ids, current player, clues left, lives left, turns left, depth left)
+StateKey = Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...], int, int, int, int, int]
+
+PLAY, DISCARD, CLUE = "play", "discard", "clue"
+
+
+class EndgameSolver:
+    """Exact final round search for full game data with an empty deck.
+
+    With no cards left to draw, hand order and clue contents do not matter anymore, so the state is reduced
+    to played piles, sorted hands and counters. Moves are deduplicated by card id, misplays are skipped
+    (giving a clue or discarding is never worse) and all clues are a single pass move.
+    Values are cached in a transposition table that is kept between calls.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None):
+        self.max_depth = max_depth
+        self.table: Dict[StateKey, int] = {}
+        self.nodes = 0
+
+    def solve(self, data: GameData) -> Tuple[int, Optional[Action]]:
+        """Return the best reachable score and the action that reaches it for the current player"""
+        if not data.deck.is_empty():
+            raise ValueError("Endgame solver needs an empty deck")
+        table = data.config.cards.table
+        self._max_number = table.max_number
+        self._max_score = table.max_number * len(table.colors)
+        self._max_clues = data.config.max_clues
+        self._unlimited_clues = data.config.unlimited_clues
+        self._bonus = {table.card_id(card): card.clues for p in data.players for card in p.cards}
+        played = tuple(data.state.played.cards.get(color.char, 0) for color in table.colors)
+        hands = tuple(tuple(sorted(table.card_id(card) for card in p.cards)) for p in data.players)
+        state = data.state
+        depth = self.max_depth if self.max_depth is not None else -1
+        if data.game_ended:
+            return state.played.score, None
+        moves = self._moves(played, hands, state.current_player, state.clues_left)
+        if not moves:
+            next_player = (state.current_player + 1) % len(hands)
+            next_depth = self._next_depth(depth)
+            return self._value(
+                played, hands, next_player, state.clues_left, state.lives_left, state.turns_left - 1, next_depth
+            ), None
+
+        best_score, best_move = -1, moves[0]
+        for move in moves:
+            score = self._value(
+                *self._next(
+                    move,
+                    played,
+                    hands,
+                    state.current_player,
+                    state.clues_left,
+                    state.lives_left,
+                    state.turns_left,
+                    depth,
+                )
+            )
+            if score > best_score:
+                best_score, best_move = score, move
+        return best_score, self._to_action(data, best_move)
+
+    def best_action(self, view: PlayerView, samples: int = 16, rng: Optional[random.Random] = None) -> Action:
+        """Pick the action with best average solved score over determinizations of own hand"""
+        sampler = HandSampler(view, rng)
+        totals: Dict[str, float] = {}
+        actions: Dict[str, Action] = {}
+        for _ in range(samples):
+            data = sampler.sample_game_data()
+            for action in self._candidate_actions(data):
+                key = str(action)
+                new_data, _ = data.simulate(action)
+                actions[key] = action
+                totals[key] = totals.get(key, 0) + self.solve(new_data)[0]
+        return actions[max(totals, key=lambda key: (totals[key], key))]
+
+    def _candidate_actions(self, data: GameData) -> List[Action]:
+        # own cards are unknown to the player, so every position is a candidate, not only distinct cards
+        me = data.state.current_player
+        hand_size = len(data.players[me].cards)
+        actions: List[Action] = [PlayAction(player=me, card=i) for i in range(hand_size)]
+        if self._can_discard(data.state.clues_left, data.config.max_clues, data.config.unlimited_clues):
+            actions.extend(DiscardAction(player=me, card=i) for i in range(hand_size))
+        clue = self._find_clue(data)
+        if clue is not None:
+            actions.append(clue)
+        return actions
+
+    @staticmethod
+    def _can_discard(clues_left: int, max_clues: int, unlimited_clues: bool) -> bool:
+        return clues_left < max_clues or unlimited_clues
+
+    def _moves(
+        self, played: Tuple[int, ...], hands: Tuple[Tuple[int, ...], ...], player: int, clues_left: int
+    ) -> List[Tuple[str, int]]:
+        max_number = self._max_number
+        hand = hands[player]
+        distinct = sorted(set(hand))
+        moves = [(PLAY, card_id) for card_id in distinct if played[card_id // max_number] == card_id % max_number]
+        if self._can_discard(clues_left, self._max_clues, self._unlimited_clues):
+            moves.extend((DISCARD, card_id) for card_id in distinct)
+        if clues_left > 0 and any(h for i, h in enumerate(hands) if i != player):
+            moves.append((CLUE, -1))
+        return moves
+
+    def _next(
+        self,
+        move: Tuple[str, int],
+        played: Tuple[int, ...],
+        hands: Tuple[Tuple[int, ...], ...],
+        player: int,
+        clues: int,
+        lives: int,
+        turns: int,
+        depth: int,
+    ) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...], int, int, int, int, int]:
+        kind, card_id = move
+        if kind == CLUE:
+            clues -= 1
+        else:
+            hand = list(hands[player])
+            hand.remove(card_id)
+            hands = (*hands[:player], tuple(hand), *hands[player + 1 :])
+            if kind == PLAY:
+                color = card_id // self._max_number
+                played = (*played[:color], played[color] + 1, *played[color + 1 :])
+                clues = min(clues + self._bonus.get(card_id, 0), self._max_clues)
+            else:
+                clues = min(clues + 1, self._max_clues)
+        return played, hands, (player + 1) % len(hands), clues, lives, turns - 1, self._next_depth(depth)
+
+    @staticmethod
+    def _next_depth(depth: int) -> int:
+        # negative depth means unlimited search
+        return depth - 1 if depth > 0 else depth
+
+    def _value(
+        self,
+        played: Tuple[int, ...],
+        hands: Tuple[Tuple[int, ...], ...],
+        player: int,
+        clues: int,
+        lives: int,
+        turns: int,
+        depth: int,
+    ) -> int:
+        score = sum(played)
+        if turns < 1 or lives < 1 or score == self._max_score or depth == 0:
+            return score
+        key = (played, hands, player, clues, lives, turns, depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        self.nodes += 1
+
+        # no more than one card can be played per turn
+        bound = min(self._max_score, score + turns)
+        moves = self._moves(played, hands, player, clues)
+        best = score
+        if not moves:
+            best = self._value(
+                played, hands, (player + 1) % len(hands), clues, lives, turns - 1, self._next_depth(depth)
+            )
+        for move in moves:
+            best = max(best, self._value(*self._next(move, played, hands, player, clues, lives, turns, depth)))
+            if best == bound:
+                break
+        self.table[key] = best
+        return best
+
+    def _to_action(self, data: GameData, move: Tuple[str, int]) -> Action:
+        kind, card_id = move
+        me = data.state.current_player
+        if kind == CLUE:
+            return self._find_clue(data)  # type: ignore[return-value]
+        table = data.config.cards.table
+        pos = next(i for i, card in enumerate(data.players[me].cards) if table.card_id(card) == card_id)
+        if kind == PLAY:
+            return PlayAction(player=me, card=pos)
+        return DiscardAction(player=me, card=pos)
+
+    @staticmethod
+    def _find_clue(data: GameData) -> Optional[Action]:
+        me = data.state.current_player
+        if data.state.clues_left < 1:
+            return None
+        for i, player in enumerate(data.players):
+            if i != me and player.cards:
+                return ClueAction(player=me, clue=Clue(to_player=i, color=None, number=player.cards[0].number))
+        return None
@@ -0,0 +1,248 @@
+import logging
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from hanapy.contrib.bots.base import BaseBotPlayer
+from hanapy.contrib.bots.endgame import EndgameSolver
+from hanapy.core.action import Action, ClueAction, DiscardAction, PlayAction
+from hanapy.core.action_space import ActionSpace
+from hanapy.core.player import PlayerMemo, PlayerView
+from hanapy.core.sampler import HandSampler
+from hanapy.core.state import GameData
+from hanapy.utils.seeds import seed_stream
+
+logger = logging.getLogger(__name__)
+
+# action index -> (visits, total reward) of root children
+RootStats = Dict[int, Tuple[int, float]]
+
+
+class Node:
+    __slots__ = ("available", "children", "index", "total", "visits")
+
+    def __init__(self, index: int = -1):
+        self.index = index
+        self.children: Dict[int, Node] = {}
+        self.visits = 0
+        self.total = 0.0
+        self.available = 0
+
+    def ucb(self, exploration: float) -> float:
+        return self.total / self.visits + exploration * math.sqrt(math.log(self.available) / self.visits)
+
+
+class ISMCTSSearch:
+    """Single observer information set MCTS.
+
+    Every iteration samples a determinization of own hand and the deck, then descends the shared tree using
+    only actions legal in that determinization (UCB with availability counts) and finishes with a rollout.
+    Hanabi is cooperative, so all players' nodes maximize the same normalized final score.
+    """
+
+    def __init__(
+        self,
+        view: PlayerView,
+        rng: random.Random,
+        exploration: float = 0.7,
+        rollout_depth: Optional[int] = None,
+    ):
+        self.sampler = HandSampler(view, rng)
+        self.rng = rng
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.max_score: int = view.config.cards.max_number * view.config.cards.color_count
+        self.root = Node()
+        self.iterations = 0
+
+    def run(self, iterations: Optional[int] = None, deadline: Optional[float] = None) -> RootStats:
+        while (iterations is None or self.iterations < iterations) and (
+            deadline is None or time.monotonic() < deadline
+        ):
+            self.iterate()
+        return self.root_stats()
+
+    def root_stats(self) -> RootStats:
+        return {key: (child.visits, child.total) for key, child in self.root.children.items()}
+
+    def iterate(self) -> None:
+        data = self.sampler.sample_game_data()
+        node = self.root
+        path = [node]
+        while not data.game_ended:
+            space = ActionSpace.from_data(data)
+            legal = list(space.iter_legal())
+            for index in legal:
+                if index in node.children:
+                    node.children[index].available += 1
+            unexplored = [index for index in legal if index not in node.children]
+            if unexplored:
+                index = self.rng.choice(unexplored)
+                child = node.children[index] = Node(index)
+                child.available = 1
+                path.append(child)
+                self.step(data, space.action(index))
+                break
+            node = max((node.children[index] for index in legal), key=lambda n: n.ucb(self.exploration))
+            path.append(node)
+            self.step(data, space.action(node.index))
+        reward = self.rollout(data)
+        for node in path:
+            node.visits += 1
+            node.total += reward
+        self.iterations += 1
+
+    def step(self, data: GameData, action: Action) -> None:
+        action.to_update(data).apply(data)
+        data.next_turn()
+
+    def rollout(self, data: GameData) -> float:
+        depth = 0
+        while not data.game_ended and (self.rollout_depth is None or depth < self.rollout_depth):
+            self.step(data, self.rollout_action(data))
+            depth += 1
+        score: int = data.state.played.score
+        return score / self.max_score
+
+    def rollout_action(self, data: GameData) -> Action:
+        # determinized rollouts see the sampled cards, so plain heuristics are good enough here
+        me = data.state.current_player
+        cards = data.players[me].cards
+        played = data.state.played
+        for i, card in enumerate(cards):
+            if played.is_valid_play(card):
+                return PlayAction(player=me, card=i)
+        if data.state.clues_left < data.config.max_clues:
+            max_number = data.config.cards.max_number
+            for i, card in enumerate(cards):
+                if played.is_obsolete(card, max_number):
+                    return DiscardAction(player=me, card=i)
+            if data.state.clues_left == 0 or self.rng.random() < 0.5:
+                return DiscardAction(player=me, card=len(cards) - 1)
+        clues = [action for action in ActionSpace.from_data(data).actions() if isinstance(action, ClueAction)]
+        if clues:
+            return self.rng.choice(clues)
+        return DiscardAction(player=me, card=len(cards) - 1)
+
+
+def run_search(
+    view: PlayerView,
+    seed: int,
+    iterations: Optional[int],
+    deadline: Optional[float],
+    exploration: float,
+    rollout_depth: Optional[int],
+) -> RootStats:
+    rng = random.Random(seed)  # noqa: S311
+    return ISMCTSSearch(view, rng, exploration, rollout_depth).run(iterations, deadline)
+
+
+class SharedProcessPool:
+    """Worker processes shared by all ISMCTS bots of the process, players move one at a time so one pool is enough.
+    Pool grows to the largest number of workers asked for and stays up until shutdown or interpreter exit"""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+
+    def get(self, workers: int) -> ProcessPoolExecutor:
+        if self._executor is None or self._workers < workers:
+            self.shutdown()
+            self._executor = ProcessPoolExecutor(workers)
+            self._workers = workers
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._workers = 0
+
+
+SHARED_POOL = SharedProcessPool()
+
+
+class ISMCTSBotPlayer(BaseBotPlayer):
+    """Experimental. Searches each move for given number of iterations and/or seconds.
+
+    Plays much weaker than rank_conv: it beats random play, but scores about 10 at 200 iterations.
+
+    With several workers every process runs an independent search from the root with its own seed
+    (root parallelization) and the root statistics are summed, so the iteration budget is per worker.
+    Worker processes come from SHARED_POOL, so several seats with workers do not start a pool each.
+    Once the deck is empty, moves are picked by the exact endgame solver over endgame_samples determinizations.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        iterations: Optional[int] = 200,
+        time_budget: Optional[float] = None,
+        workers: int = 1,
+        exploration: float = 0.7,
+        rollout_depth: Optional[int] = None,
+        endgame_samples: int = 16,
+        seed: Optional[int] = 0,
+        log: bool = False,
+    ):
+        super().__init__(name, log)
+        if iterations is None and time_budget is None:
+            raise ValueError("Either iterations or time_budget must be set")
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.workers = workers
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.endgame_samples = endgame_samples
+        self.seed = seed
+
+    @classmethod
+    def bot(cls, **kwargs):
+        return partial(ISMCTSBotPlayer, **kwargs)
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        return SHARED_POOL.get(self.workers - 1)
+
+    async def on_game_start(self, view: PlayerView) -> PlayerMemo:
+        if self.workers > 1:
+            # start worker processes before the first move, so it does not pay for it
+            for future in [self.get_executor().submit(int) for _ in range(self.workers - 1)]:
+                future.result()
+        return view.memo
+
+    async def get_next_action(self, view: PlayerView) -> Action:
+        if view.state.cards_left == 0 and self.endgame_samples > 0:
+            rng = seed_stream(self.seed, "endgame", view.me, view.state.turn)
+            return EndgameSolver().best_action(view, self.endgame_samples, rng)
+        merged = self.search(view)
+        space = ActionSpace.from_view(view)
+        if not merged:
+            logger.warning("[%s] ISMCTS budget too small for a single iteration", view.me)
+            return next(space.actions())
+        best = max(merged, key=lambda index: (merged[index][0], merged[index][1], -index))
+        logger.debug("[%s] ISMCTS stats %s, best %s", view.me, merged, space.action(best))
+        return space.action(best)
+
+    def search(self, view: PlayerView) -> Dict[int, List[float]]:
+        """Root statistics of all workers summed by action index"""
+        # leave a bit of the budget for collecting and merging worker results.
+        # monotonic clock is system wide, so the deadline holds in worker processes too
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget * 0.95
+        seeds = [
+            seed_stream(self.seed, "ismcts", view.me, view.state.turn, worker).getrandbits(64)
+            for worker in range(self.workers)
+        ]
+        args = (self.iterations, deadline, self.exploration, self.rollout_depth)
+        futures = [self.get_executor().submit(run_search, view, seed, *args) for seed in seeds[1:]]
+        stats = [run_search(view, seeds[0], *args)] + [future.result() for future in futures]
+
+        merged: Dict[int, List[float]] = {}
+        for worker_stats in stats:
+            for key, (visits, total) in worker_stats.items():
+                merged.setdefault(key, [0, 0.0])
+                merged[key][0] += visits
+                merged[key][1] += total
+        return merged
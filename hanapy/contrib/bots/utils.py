@@ -1,20 +1,15 @@
 from typing import Iterable
 
-from hanapy.core.action import Action, ClueAction, DiscardAction, PlayAction
-from hanapy.core.card import Clue
+from hanapy.core.action import Action
+from hanapy.core.action_space import ActionSpace
 from hanapy.core.player import PlayerView
+from hanapy.core.state import GameData
 
 
 def get_possible_actions(view: PlayerView) -> Iterable[Action]:
-    yield from (PlayAction(player=view.me, card=i) for i in range(len(view.my_cards)))
-    if view.can_discard:
-        yield from (DiscardAction(player=view.me, card=i) for i in range(len(view.my_cards)))
+    return ActionSpace.from_view(view).actions()
 
-    if view.can_clue:
-        for i, other_player in enumerate(view.cards):
-            if i == view.me:
-                continue
-            all_colors = {c.color for c in other_player}
-            yield from (ClueAction(player=view.me, clue=Clue(to_player=i, color=c, number=None)) for c in all_colors)
-            all_numbers = {c.number for c in other_player}
-            yield from (ClueAction(player=view.me, clue=Clue(to_player=i, color=None, number=n)) for n in all_numbers)
+
+def get_legal_actions(data: GameData) -> Iterable[Action]:
+    """Same actions as get_possible_actions for current player of full game data"""
+    return ActionSpace.from_data(data).actions()
@@ -1,5 +1,4 @@
 from collections import defaultdict
-from copy import deepcopy
 from functools import wraps
 from typing import Dict, List, Optional, Tuple
 
@@ -106,7 +105,7 @@ class ConventionsView:
 
     def can_be_critical(self, focus: int, clue: Clue) -> bool:
         if clue.to_player == self.me:
-            card_info = deepcopy(self.view.my_cards[focus])
+            card_info = self.view.my_cards[focus].copy()
             card_info.touch(clue)
             return any(
                 self._can_be_critical(card) and not self.view.state.played.is_valid_play(card)
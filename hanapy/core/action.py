@@ -1,12 +1,14 @@
-from typing import TYPE_CHECKING, ClassVar, List, Optional
+from typing import TYPE_CHECKING, ClassVar, List, Optional, Tuple
 
 from msgspec import Struct
 
 from hanapy.core.card import Card, CardInfo, Clue
+from hanapy.core.config import DiscardPile, PlayedCards
 from hanapy.core.errors import InvalidUpdateError
 from hanapy.utils.ser import PolyStruct
 
 if TYPE_CHECKING:
+    from hanapy.core.player import PlayerView
     from hanapy.core.state import GameData
 
 
@@ -46,6 +48,17 @@ class ClueResult(Clue):
         return f"Clue[to={self.to_player},{val},touched={self.touched}]"
 
 
+class UndoInfo(Struct):
+    lives_left: int
+    clues_left: int
+    turns_left: int
+    cards_left: int
+    played: PlayedCards
+    discarded: DiscardPile
+    card_info: Optional[CardInfo] = None
+    clued_masks: Optional[List[Tuple[int, bool]]] = None
+
+
 class StateUpdate(Struct):
     player: int
     lives: int = 0
@@ -55,7 +68,16 @@ class StateUpdate(Struct):
     new_card: Optional[Card] = None
     clue: Optional[ClueResult] = None
 
-    def apply(self, game_data: "GameData") -> None:
+    def apply(self, game_data: "GameData") -> UndoInfo:
+        state = game_data.state
+        undo = UndoInfo(
+            lives_left=state.lives_left,
+            clues_left=state.clues_left,
+            turns_left=state.turns_left,
+            cards_left=state.cards_left,
+            played=state.played,
+            discarded=state.discarded,
+        )
         game_data.state.lives_left += self.lives
         game_data.state.clues_left = min(game_data.state.clues_left + self.clues, game_data.config.max_clues)
         player: Optional[int] = None
@@ -63,29 +85,95 @@ class StateUpdate(Struct):
         if self.discard is not None:
             player = self.discard.player
             del game_data.players[player].cards[self.discard.pos]
-            game_data.state.clued.pop_card(
+            undo.card_info = game_data.state.clued.pop_card(
                 player, self.discard.pos, CardInfo.create(game_data.config.cards) if new_card_dealed else None
             )
-            game_data.state.discarded.cards.append(self.discard.card)
+            game_data.state.discarded = game_data.state.discarded.with_card(self.discard.card)
+            game_data.reveal_card(player, self.discard.card, drawn=False)
         if self.play is not None:
             player = self.play.player
             if not self.discard:
                 del game_data.players[player].cards[self.play.pos]
-                game_data.state.clued.pop_card(
+                undo.card_info = game_data.state.clued.pop_card(
                     player, self.play.pos, CardInfo.create(game_data.config.cards) if new_card_dealed else None
                 )
-            game_data.state.played.play(self.play.card)
+                game_data.reveal_card(player, self.play.card, drawn=False)
+            game_data.state.played = game_data.state.played.with_card(self.play.card)
         if new_card_dealed:
             assert player is not None
             new_card = game_data.deck.draw()
             assert new_card == self.new_card
             game_data.players[player].gain_card(new_card)
+            game_data.reveal_card(player, new_card, drawn=True)
             game_data.state.cards_left -= 1
         if self.clue is not None:
+            undo.clued_masks = [(c.mask, c.is_touched) for c in game_data.state.clued[self.clue.to_player]]
             game_data.state.clued.apply_clue(self.clue.to_player, self.clue, self.clue.touched)
 
         if game_data.deck.is_empty():
             game_data.state.turns_left -= 1
+        return undo
+
+    def apply_view(self, view: "PlayerView") -> None:
+        """Same as apply, but for game data as the player sees it. Card info of the view is not refreshed"""
+        state = view.state
+        state.lives_left += self.lives
+        state.clues_left = min(state.clues_left + self.clues, view.config.max_clues)
+        removed = self.discard or self.play
+        if removed is not None:
+            self._remove_view_card(view, removed)
+        if self.clue is not None:
+            state.clued.apply_clue(self.clue.to_player, self.clue, self.clue.touched)
+
+        if state.cards_left == 0:
+            state.turns_left -= 1
+
+    def _remove_view_card(self, view: "PlayerView", removed: PlayerPosCard) -> None:
+        state = view.state
+        table = view.config.cards.table
+        player = removed.player
+        new_card = self.new_card
+        state.clued.pop_card(player, removed.pos, CardInfo.create(view.config.cards) if new_card is not None else None)
+        if self.discard is not None:
+            state.discarded = state.discarded.with_card(self.discard.card)
+        if self.play is not None:
+            state.played = state.played.with_card(self.play.card)
+        if player == view.me:
+            if view.visible:
+                view.visible[table.card_id(removed.card)] += 1
+        else:
+            del view.cards[player][removed.pos]
+        if new_card is not None:
+            if player != view.me:
+                view.cards[player].insert(0, new_card)
+                if view.visible:
+                    view.visible[table.card_id(new_card)] += 1
+            state.cards_left -= 1
+
+    def undo(self, game_data: "GameData", undo: UndoInfo) -> None:
+        state = game_data.state
+        if self.clue is not None and undo.clued_masks is not None:
+            for card_info, (mask, is_touched) in zip(state.clued[self.clue.to_player], undo.clued_masks):
+                card_info.mask = mask
+                card_info.is_touched = is_touched
+        removed = self.discard or self.play
+        if removed is not None:
+            player = removed.player
+            if self.new_card is not None:
+                new_card = game_data.players[player].loose_card(0)
+                state.clued[player].pop(0)
+                game_data.deck.put_back(new_card)
+                game_data.reveal_card(player, new_card, drawn=True, count=-1)
+            game_data.players[player].cards.insert(removed.pos, removed.card)
+            assert undo.card_info is not None
+            state.clued[player].insert(removed.pos, undo.card_info)
+            game_data.reveal_card(player, removed.card, drawn=False, count=-1)
+        state.played = undo.played
+        state.discarded = undo.discarded
+        state.lives_left = undo.lives_left
+        state.clues_left = undo.clues_left
+        state.turns_left = undo.turns_left
+        state.cards_left = undo.cards_left
 
     def validate(self, game_data: "GameData") -> None:
         new_clues = game_data.state.clues_left + self.clues
@@ -0,0 +1,120 @@
+from typing import Dict, Iterator, List, Sequence, Union
+
+from hanapy.core.action import Action, ClueAction, ClueResult, DiscardAction, PlayAction
+from hanapy.core.card import Card, Clue
+from hanapy.core.config import GameConfig
+from hanapy.core.player import PlayerView
+from hanapy.core.state import GameData
+
+
+class ActionSpace:
+    """Legal actions of one player with fixed indexing for a game config.
+
+    Indices are play 0..hand_size-1, then discard 0..hand_size-1, then for each other player
+    (by offset from me) clue every color and then every number. Touched positions of every clue
+    are precomputed as bitmasks, so actions can be checked and scored by index.
+    """
+
+    def __init__(self, config: GameConfig, me: int, hands: Sequence[Sequence[Card]], hand_size: int, clues_left: int):
+        table = config.cards.table
+        self.config = config
+        self.me = me
+        self.colors = table.colors
+        self.clue_kinds = len(table.colors) + table.max_number
+        self.size = 2 * config.hand_size + (config.player_count - 1) * self.clue_kinds
+        self.touched: List[int] = [0] * self.size
+        for offset in range(1, config.player_count):
+            base = self.clue_index(offset, 0)
+            for pos, card in enumerate(hands[(me + offset) % config.player_count]):
+                self.touched[base + table.color_index[card.color.char]] |= 1 << pos
+                self.touched[base + len(self.colors) + card.number - 1] |= 1 << pos
+
+        own_cards = (1 << hand_size) - 1
+        self.legal = own_cards
+        if clues_left < config.max_clues:
+            self.legal |= own_cards << config.hand_size
+        if clues_left > 0:
+            for index in range(2 * config.hand_size, self.size):
+                if self.touched[index]:
+                    self.legal |= 1 << index
+        self._actions: Dict[int, Action] = {}
+
+    @classmethod
+    def from_view(cls, view: PlayerView) -> "ActionSpace":
+        return ActionSpace(view.config, view.me, view.cards, len(view.my_cards), view.state.clues_left)
+
+    @classmethod
+    def from_data(cls, data: GameData) -> "ActionSpace":
+        me = data.state.current_player
+        hands = [player.cards for player in data.players]
+        return ActionSpace(data.config, me, hands, len(hands[me]), data.state.clues_left)
+
+    def clue_index(self, offset: int, kind: int) -> int:
+        return 2 * self.config.hand_size + (offset - 1) * self.clue_kinds + kind
+
+    def index(self, action: Action) -> int:
+        hand_size = self.config.hand_size
+        if isinstance(action, (PlayAction, DiscardAction)):
+            if not 0 <= action.card < hand_size:
+                raise ValueError(f"No card {action.card} in hand")
+            return action.card if isinstance(action, PlayAction) else hand_size + action.card
+        if isinstance(action, ClueAction):
+            clue = action.clue
+            offset = (clue.to_player - self.me) % self.config.player_count
+            if offset == 0:
+                raise ValueError("Cannot clue self")
+            if clue.color is not None:
+                return self.clue_index(offset, self.config.cards.table.color_index[clue.color.char])
+            if clue.number is not None:
+                return self.clue_index(offset, len(self.colors) + clue.number - 1)
+        raise ValueError(f"No index for {action}")
+
+    def get_clue(self, index: int) -> Clue:
+        offset, kind = divmod(index - 2 * self.config.hand_size, self.clue_kinds)
+        to_player = (self.me + offset + 1) % self.config.player_count
+        if kind < len(self.colors):
+            return Clue(to_player=to_player, color=self.colors[kind], number=None)
+        return Clue(to_player=to_player, color=None, number=kind - len(self.colors) + 1)
+
+    def get_clue_result(self, index: int) -> ClueResult:
+        clue = self.get_clue(index)
+        touched = self.touched[index]
+        return ClueResult(
+            to_player=clue.to_player,
+            color=clue.color,
+            number=clue.number,
+            touched=[pos for pos in range(touched.bit_length()) if touched >> pos & 1],
+        )
+
+    def action(self, index: int) -> Action:
+        action = self._actions.get(index)
+        if action is None:
+            hand_size = self.config.hand_size
+            if index < hand_size:
+                action = PlayAction(player=self.me, card=index)
+            elif index < 2 * hand_size:
+                action = DiscardAction(player=self.me, card=index - hand_size)
+            else:
+                action = ClueAction(player=self.me, clue=self.get_clue(index))
+            self._actions[index] = action
+        return action
+
+    def is_legal(self, action: Union[int, Action]) -> bool:
+        if isinstance(action, int):
+            index = action
+        else:
+            try:
+                index = self.index(action)
+            except ValueError:
+                return False
+        return 0 <= index < self.size and bool(self.legal >> index & 1)
+
+    def iter_legal(self) -> Iterator[int]:
+        legal = self.legal
+        while legal:
+            low = legal & -legal
+            yield low.bit_length() - 1
+            legal ^= low
+
+    def actions(self) -> Iterator[Action]:
+        return (self.action(index) for index in self.iter_legal())
@@ -1,7 +1,7 @@
-from typing import TYPE_CHECKING, Iterable, List, Literal, Optional, overload
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Literal, Optional, Tuple, overload
 
 import msgspec
-from ordered_set import OrderedSet
 
 if TYPE_CHECKING:
     from hanapy.core.config import CardConfig
@@ -40,6 +40,98 @@ class Card(msgspec.Struct, frozen=True):
         return res
 
 
+class CardTable:
+    """Compact card encoding for a card config: card id is color index * max number + number - 1.
+
+    Tables are shared by all card infos of a game, card infos keep only the key of their table, see get_card_table.
+    """
+
+    def __init__(self, colors: Tuple[Color, ...], counts: Tuple[int, ...]):
+        self.colors = colors
+        self.counts = counts
+
+    def __eq__(self, other):
+        return isinstance(other, CardTable) and (self.colors, self.counts) == (other.colors, other.counts)
+
+    def __hash__(self):
+        return hash((self.colors, self.counts))
+
+    def __repr__(self):
+        return f"CardTable(colors={self.colors}, counts={self.counts})"
+
+    def __reduce__(self):
+        return get_card_table, (self.colors, self.counts)
+
+    def __copy__(self) -> "CardTable":
+        return self
+
+    def __deepcopy__(self, memo) -> "CardTable":
+        return self
+
+    @property
+    def max_number(self) -> int:
+        return len(self.counts)
+
+    @cached_property
+    def key(self) -> str:
+        colors = ",".join(f"{color.char}:{color.value}" for color in self.colors)
+        return f"{colors}|{','.join(map(str, self.counts))}"
+
+    @cached_property
+    def size(self) -> int:
+        return len(self.colors) * len(self.counts)
+
+    @cached_property
+    def color_index(self) -> Dict[str, int]:
+        return {color.char: i for i, color in enumerate(self.colors)}
+
+    @cached_property
+    def cards(self) -> Tuple[Card, ...]:
+        return tuple(Card(color, number) for color in self.colors for number in range(1, self.max_number + 1))
+
+    @cached_property
+    def card_counts(self) -> Tuple[int, ...]:
+        return self.counts * len(self.colors)
+
+    @cached_property
+    def full_mask(self) -> int:
+        return (1 << self.size) - 1
+
+    @cached_property
+    def color_masks(self) -> Tuple[int, ...]:
+        row = (1 << len(self.counts)) - 1
+        return tuple(row << (i * len(self.counts)) for i in range(len(self.colors)))
+
+    @cached_property
+    def number_masks(self) -> Tuple[int, ...]:
+        column = sum(1 << (i * len(self.counts)) for i in range(len(self.colors)))
+        return tuple(column << i for i in range(len(self.counts)))
+
+    def card_id(self, card: Card) -> int:
+        return self.color_index[card.color.char] * len(self.counts) + card.number - 1
+
+    def count_cards(self, cards: Iterable[Card], counts: List[int]) -> List[int]:
+        color_index = self.color_index
+        max_number = len(self.counts)
+        for card in cards:
+            counts[color_index[card.color.char] * max_number + card.number - 1] += 1
+        return counts
+
+
+@lru_cache(maxsize=None)
+def get_card_table(colors: Tuple[Color, ...], counts: Tuple[int, ...]) -> CardTable:
+    return CardTable(colors, counts)
+
+
+@lru_cache(maxsize=None)
+def get_card_table_by_key(key: str) -> CardTable:
+    colors, counts = key.split("|")
+    return get_card_table(
+        tuple(Color(*color.split(":", 1)) for color in colors.split(",") if color),
+        tuple(int(count) for count in counts.split(",") if count),
+    )
+
+
 class Clue(msgspec.Struct):
     to_player: int
     color: Optional[Color]
@@ -84,33 +176,51 @@ class Clue(msgspec.Struct):
 
 
 class CardInfo(msgspec.Struct):
-    colors: OrderedSet[Color]
-    numbers: OrderedSet[int]
+    """Possible cards as a bitmask over card ids of the card table, the table is looked up by its key"""
+
+    mask: int
     is_touched: bool
+    table_key: str
+
+    @property
+    def table(self) -> CardTable:
+        return get_card_table_by_key(self.table_key)
+
+    @property
+    def colors(self) -> List[Color]:
+        table = self.table
+        return [color for color, row in zip(table.colors, table.color_masks) if self.mask & row]
+
+    @property
+    def numbers(self) -> List[int]:
+        return [number for number, column in enumerate(self.table.number_masks, start=1) if self.mask & column]
 
     @property
     def number(self) -> Optional[int]:
-        if len(self.numbers) == 1:
-            return next(iter(self.numbers))
+        numbers = self.numbers
+        if len(numbers) == 1:
+            return numbers[0]
         return None
 
     @property
     def color(self) -> Optional[Color]:
-        if len(self.colors) == 1:
-            return next(iter(self.colors))
+        colors = self.colors
+        if len(colors) == 1:
+            return colors[0]
         return None
 
     @property
     def is_known(self) -> bool:
-        return self.color is not None and self.number is not None
+        return self.mask != 0 and self.mask & (self.mask - 1) == 0
+
+    @property
+    def count(self) -> int:
+        return bin(self.mask).count("1")
 
     @classmethod
     def create(cls, card_config: "CardConfig"):
-        return CardInfo(
-            colors=OrderedSet(card_config.colors),
-            numbers=OrderedSet(range(1, card_config.max_number + 1)),
-            is_touched=False,
-        )
+        table = card_config.table
+        return CardInfo(mask=table.full_mask, is_touched=False, table_key=table.key)
 
     def to_str(self):
         num = str(self.number or "?")
@@ -129,29 +239,55 @@ class CardInfo(msgspec.Struct):
     def as_card(self, force: Literal[False] = False) -> Optional[Card]: ...
 
     def as_card(self, force: bool = False) -> Optional[Card]:
-        if self.color is not None and self.number is not None:
-            return Card(color=self.color, number=self.number)
+        if self.is_known:
+            return self.table.cards[self.mask.bit_length() - 1]
         if force:
             raise ValueError()
         return None
 
     def touch(self, clue: Clue):
+        table = self.table
         if clue.number is not None:
-            self.numbers = OrderedSet((clue.number,))
+            self.mask &= table.number_masks[clue.number - 1]
         if clue.color is not None:
-            self.colors = OrderedSet((clue.color,))
+            self.mask &= table.color_masks[table.color_index[clue.color.char]]
         self.is_touched = True
 
     def not_touch(self, clue: Clue):
+        table = self.table
         if clue.color is not None:
-            self.colors.discard(clue.color)
+            self.mask &= ~table.color_masks[table.color_index[clue.color.char]]
         if clue.number is not None:
-            self.numbers.discard(clue.number)
+            self.mask &= ~table.number_masks[clue.number - 1]
+
+    def remove_impossible(self, impossible: int) -> bool:
+        """Remove colors and numbers that have only impossible cards left"""
+        mask = self.mask
+        table = self.table
+        for row in table.color_masks:
+            if mask & row and not mask & row & ~impossible:
+                mask &= ~row
+        for column in table.number_masks:
+            if mask & column and not mask & column & ~impossible:
+                mask &= ~column
+        changed = mask != self.mask
+        self.mask = mask
+        return changed
+
+    def copy(self) -> "CardInfo":
+        return CardInfo(mask=self.mask, is_touched=self.is_touched, table_key=self.table_key)
+
+    def iter_possible_ids(self) -> Iterable[int]:
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
 
     def iter_possible(self) -> Iterable[Card]:
-        for color in self.colors:
-            for number in self.numbers:
-                yield Card(color=color, number=number)
+        cards = self.table.cards
+        for card_id in self.iter_possible_ids():
+            yield cards[card_id]
 
 
 class CluedCards(msgspec.Struct):
@@ -164,6 +300,9 @@ class CluedCards(msgspec.Struct):
     def create(cls, players: int, hand_size: int, card_config: "CardConfig"):
         return CluedCards(cards=[[CardInfo.create(card_config) for _ in range(hand_size)] for _ in range(players)])
 
+    def copy(self) -> "CluedCards":
+        return CluedCards(cards=[[card_info.copy() for card_info in cards] for cards in self.cards])
+
     def apply_clue(self, player: int, clue: Clue, touched: List[int]):
         for i, card_info in enumerate(self.cards[player]):
             if i in touched:
@@ -171,7 +310,8 @@ class CluedCards(msgspec.Struct):
             else:
                 card_info.not_touch(clue)
 
-    def pop_card(self, player: int, card: int, new: Optional[CardInfo]):
-        self.cards[player].pop(card)
+    def pop_card(self, player: int, card: int, new: Optional[CardInfo]) -> CardInfo:
+        card_info = self.cards[player].pop(card)
         if new is not None:
             self.cards[player].insert(0, new)
+        return card_info
@@ -1,12 +1,13 @@
-from typing import Dict, List, Union
+from functools import cached_property
+from typing import Dict, List, Tuple, Union
 
-from msgspec import Struct
+from msgspec import Struct, structs
 
-from hanapy.core.card import Card, CardInfo, CluedCards, Color
+from hanapy.core.card import Card, CardInfo, CardTable, CluedCards, Color, get_card_table
 from hanapy.types import SeenCards
 
 
-class PlayedCards(Struct):
+class PlayedCards(Struct, frozen=True):
     cards: Dict[str, int]
 
     @classmethod
@@ -36,9 +37,10 @@ class PlayedCards(Struct):
             return self.cards[card.color.char] == max_number
         return False
 
-    def play(self, card: Card) -> None:
-        if self.is_valid_play(card):
-            self.cards[card.color.char] += 1
+    def with_card(self, card: Card) -> "PlayedCards":
+        if not self.is_valid_play(card):
+            return self
+        return PlayedCards(cards={**self.cards, card.color.char: card.number})
 
     def is_complete(self, color_count: int, max_card_number: int) -> bool:
         return len(self.cards) == color_count and all(v == max_card_number for v in self.cards.values())
@@ -48,25 +50,41 @@ class PlayedCards(Struct):
         return sum(self.cards.values())
 
     def get_all_cards(self, colors: List[Color]) -> SeenCards:
+        by_char = {c.char: c for c in colors}
         return SeenCards(
-            Card(color=Color.parse(c, colors), number=n)
-            for c, max_num in self.cards.items()
-            for n in range(1, max_num + 1)
+            Card(color=by_char[c], number=n) for c, max_num in self.cards.items() for n in range(1, max_num + 1)
         )
 
+    def count_cards(self, table: CardTable, counts: List[int]) -> List[int]:
+        for char, max_num in self.cards.items():
+            start = table.color_index[char] * table.max_number
+            for card_id in range(start, start + max_num):
+                counts[card_id] += 1
+        return counts
 
-class DiscardPile(Struct):
-    cards: List[Card]
+
+class DiscardPile(Struct, frozen=True):
+    cards: Tuple[Card, ...]
 
     @classmethod
     def new(cls):
-        return DiscardPile(cards=[])
+        return DiscardPile(cards=())
+
+    def with_card(self, card: Card) -> "DiscardPile":
+        return DiscardPile(cards=(*self.cards, card))
+
+    def count_cards(self, table: CardTable, counts: List[int]) -> List[int]:
+        return table.count_cards(self.cards, counts)
 
 
-class CardConfig(Struct):
+class CardConfig(Struct, frozen=True, dict=True):
     colors: List[Color]
     counts: Dict[int, int]
 
+    @cached_property
+    def table(self) -> CardTable:
+        return get_card_table(tuple(self.colors), tuple(self.counts[n] for n in range(1, self.max_number + 1)))
+
     @property
     def max_number(self):
         return max(self.counts)
@@ -101,8 +119,12 @@ class GameState(Struct):
             cards_left=cards_left,
         )
 
+    def copy(self) -> "GameState":
+        # played and discarded piles are frozen and replaced by updates, so copies can share them
+        return structs.replace(self, clued=self.clued.copy())
+
 
-class GameConfig(Struct):
+class GameConfig(Struct, frozen=True):
     max_lives: int
     hand_size: int
     player_count: int
@@ -12,6 +12,9 @@ class Deck:
     def draw(self) -> Card:
         return self.cards.pop()
 
+    def put_back(self, card: Card) -> None:
+        self.cards.append(card)
+
     def peek(self) -> Optional[Card]:
         return self.cards[-1] if len(self.cards) else None
 
@@ -3,8 +3,9 @@ import logging
 import os.path
 import shutil
 import warnings
+from abc import ABC, abstractmethod
 from copy import deepcopy
-from typing import Awaitable, Callable, List, Optional, Sequence
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
 
 import msgspec
 from msgspec import Struct
@@ -13,8 +14,19 @@ from hanapy.core.action import Action, StateUpdate
 from hanapy.core.config import GameConfig, GameState
 from hanapy.core.deck import DeckGenerator
 from hanapy.core.errors import InvalidUpdateError
-from hanapy.core.player import PlayerActor, PlayerMemo, PlayerState, PlayerView
+from hanapy.core.player import PlayerActor, PlayerMemo, PlayerState, PlayerView, SyncPlayerActor, as_sync_player
 from hanapy.core.state import GameData
+from hanapy.core.timing import (
+    APPLY,
+    GET_NEXT_ACTION,
+    OBSERVE_UPDATE,
+    TO_UPDATE,
+    VALIDATE,
+    VIEW,
+    NullPhaseTimer,
+    PhaseTimer,
+    TimingSink,
+)
 from hanapy.utils.ser import dumps
 
 logger = logging.getLogger(__name__)
@@ -36,6 +48,77 @@ class TurnLog(Struct):
     update: StateUpdate
 
 
+class CompactTurnLog(Struct):
+    turn: int
+    action: Action
+    update: StateUpdate
+
+
+class CompactGameLog(Struct):
+    """Game data is stored only at checkpoints and is replayed from the closest one on access.
+    Player memos in replayed data are the ones saved at that checkpoint"""
+
+    turns: List[CompactTurnLog] = msgspec.field(default_factory=list)
+    checkpoints: Dict[int, GameData] = msgspec.field(default_factory=dict)
+    checkpoint_every: int = 0
+
+    def add(self, data: GameData, action: Action, update: StateUpdate) -> None:
+        index = len(self.turns)
+        if index == 0 or (self.checkpoint_every > 0 and index % self.checkpoint_every == 0):
+            self.checkpoints[index] = deepcopy(data)
+        self.turns.append(CompactTurnLog(turn=data.state.turn, action=action, update=update))
+
+    def get_data(self, index: int) -> GameData:
+        checkpoint = max(i for i in self.checkpoints if i <= index)
+        data = deepcopy(self.checkpoints[checkpoint])
+        for log in self.turns[checkpoint:index]:
+            log.update.apply(data)
+            data.next_turn()
+        return data
+
+    def __len__(self):
+        return len(self.turns)
+
+    @overload
+    def __getitem__(self, item: int) -> TurnLog: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> List[TurnLog]: ...
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[TurnLog, List[TurnLog]]:
+        if isinstance(item, slice):
+            return list(self)[item]
+        if item < 0:
+            item += len(self.turns)
+        if not 0 <= item < len(self.turns):
+            raise IndexError(item)
+        log = self.turns[item]
+        return TurnLog(turn=log.turn, data=self.get_data(item), action=log.action, update=log.update)
+
+    def __iter__(self) -> Iterator[TurnLog]:
+        if len(self.turns) == 0:
+            return
+        data = self.get_data(0)
+        for log in self.turns:
+            yield TurnLog(turn=log.turn, data=deepcopy(data), action=log.action, update=log.update)
+            log.update.apply(data)
+            data.next_turn()
+
+
+GameLogs = Union[List[TurnLog], CompactGameLog]
+
+
+class TurnLogSink(ABC):
+    """Receives every turn as soon as it is played. Game data in the log is not copied and changes after the call"""
+
+    @abstractmethod
+    def write(self, log: TurnLog) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        return
+
+
 class GameLoop:
     def __init__(self, players: List[PlayerActor], deck_generator: DeckGenerator, config: GameConfig):
         self.player_actors = players
@@ -55,11 +138,43 @@ class GameLoop:
             state=GameState.create(config, deck.size()),
             config=config,
         )
-        self.logs: List[TurnLog] = []
+        self.logs: GameLogs = []
+        self.log_sinks: List[TurnLogSink] = []
+        self.timer: PhaseTimer = NullPhaseTimer()
+
+    def use_timing(self, sink: TimingSink):
+        self.timer = PhaseTimer(sink)
+
+    def use_compact_logs(self, checkpoint_every: int = 0):
+        self.logs = CompactGameLog(checkpoint_every=checkpoint_every)
+
+    def add_log_sink(self, sink: TurnLogSink):
+        # full game data of every turn goes to the sink, in memory only actions and updates are kept
+        if isinstance(self.logs, list) and not self.logs:
+            self.use_compact_logs()
+        self.log_sinks.append(sink)
+
+    def log_turn(self, action: Action, update: StateUpdate):
+        if self.log_sinks:
+            log = TurnLog(turn=self.data.state.turn, data=self.data, action=action, update=update)
+            for sink in self.log_sinks:
+                sink.write(log)
+        if isinstance(self.logs, CompactGameLog):
+            self.logs.add(self.data, action, update)
+        else:
+            self.logs.append(TurnLog(turn=self.data.state.turn, data=deepcopy(self.data), action=action, update=update))
 
     def enum_player_views(self):
         yield from ((p, self.data.get_player_view(i)) for i, p in enumerate(self.player_actors))
 
+    def get_player_views(self) -> List[PlayerView]:
+        views = []
+        self.timer.start()
+        for player in range(len(self.player_actors)):
+            views.append(self.data.get_player_view(player))
+            self.timer.stop(VIEW, player)
+        return views
+
     async def run(
         self,
         turn_begin_callback: Optional[Callable[[int, PlayerView], Awaitable]] = None,
@@ -69,31 +184,40 @@ class GameLoop:
         for player, memo in enumerate(memos):
             self.data.update_player_memo(player, memo)
 
+        timer = self.timer
         while True:
-            current_player_actor = self.player_actors[self.data.state.current_player]
+            current_player = self.data.state.current_player
+            timer.turn = self.data.state.turn
+            current_player_actor = self.player_actors[current_player]
+            timer.start()
             current_player_view = self.data.get_current_player_view()
+            timer.stop(VIEW, current_player)
 
             if turn_begin_callback is not None:
-                await turn_begin_callback(self.data.state.current_player, current_player_view)
+                await turn_begin_callback(current_player, current_player_view)
             while True:
+                timer.start()
                 action = await current_player_actor.get_next_action(current_player_view)
+                timer.stop(GET_NEXT_ACTION, current_player)
                 update = action.to_update(self.data)
+                timer.stop(TO_UPDATE, current_player)
                 try:
                     update.validate(self.data)
+                    timer.stop(VALIDATE, current_player)
                     break
                 except InvalidUpdateError as e:
                     await current_player_actor.on_invalid_action(e.args[0])
                     continue
             await current_player_actor.on_valid_action()
-            self.logs.append(
-                TurnLog(turn=self.data.state.turn, data=(deepcopy(self.data)), action=action, update=update)
-            )
-            old_views = [deepcopy(v) for _, v in self.enum_player_views()]
+            self.log_turn(action, update)
+            old_views = self.get_player_views()
+            timer.start()
             update.apply(self.data)
+            timer.stop(APPLY, current_player)
             new_memos = await asyncio.gather(
                 *[
-                    player.observe_update(old_views[i], update, view)
-                    for i, (player, view) in enumerate(self.enum_player_views())
+                    timer.wrap(OBSERVE_UPDATE, i, player.observe_update(old_views[i], update, view))
+                    for i, (player, view) in enumerate(zip(self.player_actors, self.get_player_views()))
                 ]
             )
             for player, player_state in enumerate(self.data.players):
@@ -107,10 +231,79 @@ class GameLoop:
                         for player, view in self.enum_player_views()
                     ]
                 )
+                self.flush_logs()
                 break
             if turn_end_callback is not None:
                 await turn_end_callback(self.data)
 
+    def run_sync(
+        self,
+        turn_begin_callback: Optional[Callable[[int, PlayerView], None]] = None,
+        turn_end_callback: Optional[Callable[[GameData], None]] = None,
+    ) -> None:
+        """Same as run, but without event loop. Every player should be a SyncPlayerActor or never suspend"""
+        players = [as_sync_player(p) for p in self.player_actors]
+        views = [view for _, view in self.enum_player_views()]
+        memos = [player_actor.on_game_start_sync(view) for player_actor, view in zip(players, views)]
+        for player, memo in enumerate(memos):
+            self.data.update_player_memo(player, memo)
+
+        timer = self.timer
+        while True:
+            current_player = self.data.state.current_player
+            timer.turn = self.data.state.turn
+            current_player_actor = players[current_player]
+            timer.start()
+            current_player_view = self.data.get_current_player_view()
+            timer.stop(VIEW, current_player)
+
+            if turn_begin_callback is not None:
+                turn_begin_callback(current_player, current_player_view)
+            action, update = self._get_valid_action_sync(current_player_actor, current_player_view)
+            self.log_turn(action, update)
+            old_views = self.get_player_views()
+            timer.start()
+            update.apply(self.data)
+            timer.stop(APPLY, current_player)
+            views = self.get_player_views()
+            new_memos = []
+            timer.start()
+            for i, (player_actor, view) in enumerate(zip(players, views)):
+                new_memos.append(player_actor.observe_update_sync(old_views[i], update, view))
+                timer.stop(OBSERVE_UPDATE, i)
+            for player, player_state in enumerate(self.data.players):
+                player_state.memo = new_memos[player]
+
+            self.data.next_turn()
+            if self.data.game_ended:
+                views = [view for _, view in self.enum_player_views()]
+                for player_actor, view in zip(players, views):
+                    player_actor.on_game_end_sync(view, self.data.get_game_result())
+                self.flush_logs()
+                break
+            if turn_end_callback is not None:
+                turn_end_callback(self.data)
+
+    def _get_valid_action_sync(self, player_actor: SyncPlayerActor, view: PlayerView) -> Tuple[Action, StateUpdate]:
+        while True:
+            self.timer.start()
+            action = player_actor.get_next_action_sync(view)
+            self.timer.stop(GET_NEXT_ACTION, view.me)
+            update = action.to_update(self.data)
+            self.timer.stop(TO_UPDATE, view.me)
+            try:
+                update.validate(self.data)
+                self.timer.stop(VALIDATE, view.me)
+                break
+            except InvalidUpdateError as e:
+                player_actor.on_invalid_action_sync(e.args[0])
+        player_actor.on_valid_action_sync()
+        return action, update
+
+    def flush_logs(self) -> None:
+        for sink in self.log_sinks:
+            sink.flush()
+
     def save_logs(self, log_file: str, as_script: bool, variant, seed, players):
         if log_file.endswith(os.path.sep):
             if as_script:
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Callable, ClassVar, Counter, Dict, List, Set, Type, TypeVar, cast
+from typing import Any, Callable, ClassVar, Coroutine, Dict, List, Type, TypeVar, cast
 
-from msgspec import Struct
+from msgspec import Struct, field
 
 from hanapy.core.action import Action, StateUpdate
 from hanapy.core.card import Card, CardInfo
@@ -43,48 +43,59 @@ class PlayerView(Struct):
     cards: List[List[Card]]
     state: GameState
     config: GameConfig
+    # counts of played, discarded and other players' cards by card id, computed from the view when empty
+    visible: List[int] = field(default_factory=list)
 
     @property
     def my_cards(self) -> List[CardInfo]:
         return self.state.clued[self.me]
 
-    def get_all_seen_cards(self, except_player: int) -> SeenCards:
-        result: Counter[Card] = self.state.played.get_all_cards(self.config.cards.colors)
-        result.update(self.state.discarded.cards)
+    def get_visible_counts(self) -> List[int]:
+        if self.visible:
+            return self.visible
+        table = self.config.cards.table
+        counts = self.state.played.count_cards(table, [0] * table.size)
+        self.state.discarded.count_cards(table, counts)
         for i, cards in enumerate(self.cards):
-            if i == self.me or i == except_player:
-                continue
-            result.update(cards)
-        result.update(c.as_card() for c in self.my_cards if c.is_known)
+            if i != self.me:
+                table.count_cards(cards, counts)
+        return counts
+
+    def get_seen_counts(self, except_player: int) -> List[int]:
+        table = self.config.cards.table
+        counts = list(self.get_visible_counts())
+        if except_player != self.me and except_player < len(self.cards):
+            for card in self.cards[except_player]:
+                counts[table.card_id(card)] -= 1
+        table.count_cards((c.as_card(True) for c in self.my_cards if c.is_known), counts)
         if except_player > 0 and except_player != self.me:
-            result.update(c.as_card() for c in self.state.clued[except_player] if c.is_known)
-        return result
+            table.count_cards((c.as_card(True) for c in self.state.clued[except_player] if c.is_known), counts)
+        return counts
+
+    def get_all_seen_cards(self, except_player: int) -> SeenCards:
+        cards = self.config.cards.table.cards
+        return SeenCards({cards[i]: count for i, count in enumerate(self.get_seen_counts(except_player)) if count > 0})
 
     def refresh_card_info(self):
-        while any(self.refresh_player_card_info(p) for p in range(self.config.player_count)):
-            continue
+        # own known cards are seen when refreshing any hand, other players' ones only when refreshing their hand
+        pending = list(range(self.config.player_count))
+        while pending:
+            player = pending.pop(0)
+            if not self.refresh_player_card_info(player):
+                continue
+            affected = range(self.config.player_count) if player == self.me else [player]
+            pending.extend(p for p in affected if p not in pending)
 
     def refresh_player_card_info(self, player: int) -> bool:
-        seen_cards = self.get_all_seen_cards(except_player=player)
-        cant_have: Set[Card] = {
-            card for card, count in seen_cards.items() if self.config.cards.counts[card.number] == count
-        }
+        seen_counts = self.get_seen_counts(except_player=player)
+        cant_have = 0
+        for card_id, (seen, total) in enumerate(zip(seen_counts, self.config.cards.table.card_counts)):
+            if seen == total:
+                cant_have |= 1 << card_id
         changed = False
         for card_info in self.state.clued[player]:
-            if card_info.is_known:
-                continue
-            for color in list(card_info.colors):
-                possible = {Card(color, num) for num in card_info.numbers}
-                # if all impossible get clue
-                if possible.intersection(cant_have) == possible:
-                    card_info.colors.discard(color)
-                    changed = True
-            for number in list(card_info.numbers):
-                possible = {Card(color, number) for color in card_info.colors}
-                # if all impossible get clue
-                if possible.intersection(cant_have) == possible:
-                    card_info.numbers.discard(number)
-                    changed = True
+            if not card_info.is_known and card_info.remove_impossible(cant_have):
+                changed = True
         return changed
 
     @property
@@ -131,6 +142,96 @@ class PlayerActor(ABC):
 
 Bot = Callable[[str], PlayerActor]
 
+RT = TypeVar("RT")
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, RT]) -> RT:
+    """Run coroutine that never suspends (like CPU-only bot methods) without event loop"""
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return cast(RT, e.value)
+    coro.close()
+    raise RuntimeError(f"{coro} needs an event loop to run")
+
+
+class SyncPlayerActor(PlayerActor, ABC):
+    @abstractmethod
+    def on_game_start_sync(self, view: PlayerView) -> PlayerMemo:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_next_action_sync(self, view: PlayerView) -> Action:
+        raise NotImplementedError
+
+    @abstractmethod
+    def observe_update_sync(self, view: PlayerView, update: StateUpdate, new_view: PlayerView) -> PlayerMemo:
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_game_end_sync(self, view: PlayerView, game_result: GameResult):
+        raise NotImplementedError
+
+    def on_valid_action_sync(self):
+        return
+
+    def on_invalid_action_sync(self, msg: str):
+        return
+
+    async def on_game_start(self, view: PlayerView) -> PlayerMemo:
+        return self.on_game_start_sync(view)
+
+    async def get_next_action(self, view: PlayerView) -> Action:
+        return self.get_next_action_sync(view)
+
+    async def observe_update(self, view: PlayerView, update: StateUpdate, new_view: PlayerView) -> PlayerMemo:
+        return self.observe_update_sync(view, update, new_view)
+
+    async def on_game_end(self, view: PlayerView, game_result: GameResult):
+        return self.on_game_end_sync(view, game_result)
+
+    async def on_valid_action(self):
+        return self.on_valid_action_sync()
+
+    async def on_invalid_action(self, msg: str):
+        return self.on_invalid_action_sync(msg)
+
+
+class SyncPlayerAdapter(SyncPlayerActor):
+    def __init__(self, player: PlayerActor):
+        super().__init__(player.name)
+        self.player = player
+
+    def on_game_start_sync(self, view: PlayerView) -> PlayerMemo:
+        return run_coroutine_sync(self.player.on_game_start(view))
+
+    def get_next_action_sync(self, view: PlayerView) -> Action:
+        return run_coroutine_sync(self.player.get_next_action(view))
+
+    def observe_update_sync(self, view: PlayerView, update: StateUpdate, new_view: PlayerView) -> PlayerMemo:
+        return run_coroutine_sync(self.player.observe_update(view, update, new_view))
+
+    def on_game_end_sync(self, view: PlayerView, game_result: GameResult):
+        return run_coroutine_sync(self.player.on_game_end(view, game_result))
+
+    def on_valid_action_sync(self):
+        return run_coroutine_sync(self.player.on_valid_action())
+
+    def on_invalid_action_sync(self, msg: str):
+        return run_coroutine_sync(self.player.on_invalid_action(msg))
+
+    def get_event_handlers(self) -> EventHandlers:
+        return self.player.get_event_handlers()
+
+    def get_name(self) -> str:
+        return self.player.get_name()
+
+
+def as_sync_player(player: PlayerActor) -> SyncPlayerActor:
+    if isinstance(player, SyncPlayerActor):
+        return player
+    return SyncPlayerAdapter(player)
+
 
 class PlayerState(Struct):
     name: str
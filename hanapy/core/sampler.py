@@ -0,0 +1,105 @@
+import random
+from typing import Dict, List, Optional, Sequence
+
+from msgspec import Struct
+
+from hanapy.core.card import Card
+from hanapy.core.deck import Deck
+from hanapy.core.player import PlayerMemo, PlayerState, PlayerView
+from hanapy.core.state import GameData
+
+
+class Determinization(Struct):
+    hand: List[Card]
+    # in Deck.cards order, so the last card is drawn first
+    deck: List[Card]
+
+
+def _iter_bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def is_feasible(masks: Sequence[int], counts: Sequence[int]) -> bool:
+    """Check that every mask can get its own card id with no more than counts[id] cards of each id"""
+    assigned: Dict[int, List[int]] = {}
+
+    def assign(pos: int, visited: set) -> bool:
+        for card_id in _iter_bits(masks[pos]):
+            if card_id in visited or counts[card_id] == 0:
+                continue
+            visited.add(card_id)
+            owners = assigned.setdefault(card_id, [])
+            if len(owners) < counts[card_id]:
+                owners.append(pos)
+                return True
+            for i, owner in enumerate(owners):
+                if assign(owner, visited):
+                    owners[i] = pos
+                    return True
+        return False
+
+    return all(assign(pos, set()) for pos in range(len(masks)))
+
+
+class HandSampler:
+    """Samples player's own hand and the deck consistent with clued card info and visible cards.
+
+    Hand cards are drawn one position at a time (most constrained first) with weights equal to the number
+    of remaining copies, skipping cards that leave the other positions without a valid assignment,
+    so no sample is ever rejected. Deck is a uniform shuffle of what is left.
+    """
+
+    def __init__(self, view: PlayerView, rng: Optional[random.Random] = None):
+        self.view = view
+        self.table = view.config.cards.table
+        self.rng = rng or random.Random()  # noqa: S311
+        self.masks = [card_info.mask for card_info in view.my_cards]
+        self.remaining = [total - seen for total, seen in zip(self.table.card_counts, view.get_visible_counts())]
+        self.order = sorted(range(len(self.masks)), key=lambda pos: bin(self.masks[pos]).count("1"))
+        # positions after which the rest of the hand is unconstrained and needs no feasibility check
+        self.free_from = len(self.order)
+        while self.free_from > 0 and self.masks[self.order[self.free_from - 1]] == self.table.full_mask:
+            self.free_from -= 1
+        if not is_feasible(self.masks, self.remaining):
+            raise ValueError("No hand is consistent with the view")
+
+    def sample_hand(self, counts: List[int]) -> List[Card]:
+        hand: List[Optional[Card]] = [None] * len(self.masks)
+        cards = self.table.cards
+        for i, pos in enumerate(self.order):
+            ids = [card_id for card_id in _iter_bits(self.masks[pos]) if counts[card_id] > 0]
+            rest = [self.masks[p] for p in self.order[i + 1 : self.free_from]]
+            while True:
+                card_id = self.rng.choices(ids, [counts[card_id] for card_id in ids])[0]
+                counts[card_id] -= 1
+                if not rest or is_feasible(rest, counts):
+                    break
+                counts[card_id] += 1
+                ids.remove(card_id)
+            hand[pos] = cards[card_id]
+        return hand  # type: ignore[return-value]
+
+    def sample(self) -> Determinization:
+        counts = list(self.remaining)
+        hand = self.sample_hand(counts)
+        deck = [card for card, count in zip(self.table.cards, counts) for _ in range(count)]
+        self.rng.shuffle(deck)
+        return Determinization(hand=hand, deck=deck)
+
+    def sample_game_data(self) -> GameData:
+        return self.to_game_data(self.sample())
+
+    def to_game_data(self, determinization: Determinization) -> GameData:
+        view = self.view
+        players = [
+            PlayerState(name=view.name, cards=determinization.hand, memo=view.memo)
+            if i == view.me
+            else PlayerState(name="", cards=list(cards), memo=PlayerMemo.create())
+            for i, cards in enumerate(view.cards)
+        ]
+        return GameData(
+            players=players, deck=Deck(list(determinization.deck)), state=view.state.copy(), config=view.config
+        )
@@ -1,9 +1,8 @@
-from copy import deepcopy
-from typing import List
+from typing import List, Optional, Tuple
 
-from msgspec import Struct
+from msgspec import Struct, structs
 
-from hanapy.core.action import PlayerPos
+from hanapy.core.action import Action, PlayerPos
 from hanapy.core.card import Card
 from hanapy.core.config import GameConfig, GameResult, GameState
 from hanapy.core.deck import Deck
@@ -14,12 +13,58 @@ class BaseGameData(Struct):
     pass
 
 
-class GameData(BaseGameData):
+class GameData(BaseGameData, dict=True):
     players: List[PlayerState]
     deck: Deck
     state: GameState
     config: GameConfig
 
+    def get_visible_counts(self, observer: int) -> List[int]:
+        visible: Optional[List[List[int]]] = getattr(self, "_visible", None)
+        if visible is None:
+            # not serialized or copied, so copies and decoded data rebuild it on first use
+            table = self.config.cards.table
+            public = self.state.discarded.count_cards(table, self.state.played.count_cards(table, [0] * table.size))
+            visible = [list(public) for _ in self.players]
+            for player, player_state in enumerate(self.players):
+                for observer_, counts in enumerate(visible):
+                    if observer_ != player:
+                        table.count_cards(player_state.cards, counts)
+            self._visible = visible
+        return visible[observer]
+
+    def reveal_card(self, player: int, card: Card, drawn: bool, count: int = 1) -> None:
+        """Update visible counts after card left player's hand or was drawn by player. Negative count reverts it"""
+        visible: Optional[List[List[int]]] = getattr(self, "_visible", None)
+        if visible is None:
+            return
+        card_id = self.config.cards.table.card_id(card)
+        for observer, counts in enumerate(visible):
+            if (observer != player) if drawn else (observer == player):
+                counts[card_id] += count
+
+    def clone(self) -> "GameData":
+        # config, cards and played/discarded piles are frozen or never mutated in place, so the clone shares them.
+        # memos are shared the same way player views share them
+        data = GameData(
+            players=[structs.replace(p, cards=list(p.cards)) for p in self.players],
+            deck=Deck(list(self.deck.cards)),
+            state=self.state.copy(),
+            config=self.config,
+        )
+        visible: Optional[List[List[int]]] = getattr(self, "_visible", None)
+        if visible is not None:
+            data._visible = [list(counts) for counts in visible]
+        return data
+
+    def simulate(self, action: Action) -> Tuple["GameData", int]:
+        """Apply action to a clone of this data and return it together with the score change"""
+        data = self.clone()
+        score = data.state.played.score
+        action.to_update(data).apply(data)
+        data.next_turn()
+        return data, data.state.played.score - score
+
     def get_current_player_view(self) -> PlayerView:
         return self.get_player_view(self.state.current_player)
 
@@ -28,9 +73,10 @@ class GameData(BaseGameData):
             name=self.players[player].name,
             me=player,
             memo=self.players[player].memo,
-            config=deepcopy(self.config),
-            cards=[deepcopy(p.cards) if i != player else [] for i, p in enumerate(self.players)],
-            state=deepcopy(self.state),
+            config=self.config,
+            cards=[list(p.cards) if i != player else [] for i, p in enumerate(self.players)],
+            state=self.state.copy(),
+            visible=list(self.get_visible_counts(player)),
         )
         view.refresh_card_info()
         return view
@@ -62,3 +108,8 @@ class GameData(BaseGameData):
         self.state.turn += 1
         self.state.current_player += 1
         self.state.current_player %= self.config.player_count
+
+    def prev_turn(self):
+        self.state.turn -= 1
+        self.state.current_player -= 1
+        self.state.current_player %= self.config.player_count
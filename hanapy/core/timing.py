@@ -0,0 +1,128 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Awaitable, Dict, Optional, Tuple, TypeVar
+
+from msgspec import Struct, field
+
+VIEW = "view"
+GET_NEXT_ACTION = "get_next_action"
+TO_UPDATE = "to_update"
+VALIDATE = "validate"
+APPLY = "apply"
+OBSERVE_UPDATE = "observe_update"
+PHASES = (VIEW, GET_NEXT_ACTION, TO_UPDATE, VALIDATE, APPLY, OBSERVE_UPDATE)
+
+RT = TypeVar("RT")
+
+
+class TimingSink(ABC):
+    @abstractmethod
+    def record(self, phase: str, player: int, turn: int, seconds: float) -> None:
+        raise NotImplementedError
+
+
+class Histogram(Struct):
+    """Durations in power of two buckets of microseconds: bucket i counts durations in [2**(i-1), 2**i) us"""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = 0.0
+    max: float = 0.0
+    buckets: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, seconds: float) -> None:
+        self.min = min(self.min, seconds) if self.count else seconds
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        bucket = max(0, math.frexp(seconds * 1e6)[1])
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket that contains q-th percentile, in seconds"""
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= q * self.count:
+                return min(math.ldexp(1.0, bucket) / 1e6, self.max)
+        return self.max
+
+
+class HistogramSink(TimingSink):
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, int], Histogram] = {}
+
+    def record(self, phase: str, player: int, turn: int, seconds: float) -> None:
+        key = (phase, player)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.add(seconds)
+
+    def get_phase(self, phase: str) -> Histogram:
+        """Histogram of the phase for all players together"""
+        merged = Histogram()
+        for (phase_, _), histogram in self.histograms.items():
+            if phase_ != phase:
+                continue
+            merged.min = min(merged.min, histogram.min) if merged.count else histogram.min
+            merged.count += histogram.count
+            merged.total += histogram.total
+            merged.max = max(merged.max, histogram.max)
+            for bucket, count in histogram.buckets.items():
+                merged.buckets[bucket] = merged.buckets.get(bucket, 0) + count
+        return merged
+
+    def summary(self) -> str:
+        lines = []
+        for phase in PHASES:
+            h = self.get_phase(phase)
+            if h.count:
+                lines.append(
+                    f"{phase:<16} n={h.count:<6} total={h.total:.3f}s mean={h.mean * 1e6:.0f}us "
+                    f"p50<={h.percentile(0.5) * 1e6:.0f}us p99<={h.percentile(0.99) * 1e6:.0f}us"
+                )
+        return "\n".join(lines)
+
+
+class PhaseTimer:
+    """Measures consecutive phases: every stop records time since the previous start or stop"""
+
+    def __init__(self, sink: TimingSink):
+        self.sink = sink
+        self.turn = 0
+        self._start = 0.0
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+
+    def stop(self, phase: str, player: int) -> None:
+        now = time.perf_counter()
+        self.sink.record(phase, player, self.turn, now - self._start)
+        self._start = now
+
+    async def wrap(self, phase: str, player: int, awaitable: Awaitable[RT]) -> RT:
+        # for coroutines running concurrently this is wall time, including waiting for the others
+        start = time.perf_counter()
+        result = await awaitable
+        self.sink.record(phase, player, self.turn, time.perf_counter() - start)
+        return result
+
+
+class NullPhaseTimer(PhaseTimer):
+    def __init__(self, sink: Optional[TimingSink] = None):
+        self.turn = 0
+
+    def start(self) -> None:
+        return
+
+    def stop(self, phase: str, player: int) -> None:
+        return
+
+    def wrap(self, phase: str, player: int, awaitable: Awaitable[RT]) -> Awaitable[RT]:  # type: ignore[override]
+        return awaitable
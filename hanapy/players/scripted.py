@@ -6,7 +6,7 @@ from msgspec import Struct
 from hanapy.contrib.bots import BOTS
 from hanapy.core.action import Action, StateUpdate
 from hanapy.core.config import GameResult
-from hanapy.core.loop import TurnLog
+from hanapy.core.loop import GameLogs, TurnLog
 from hanapy.core.player import PlayerActor, PlayerMemo, PlayerView
 from hanapy.players.console.commands import (
     ActionCommand,
@@ -92,7 +92,7 @@ class ScriptedGameConfig(Struct):
             return msgspec.yaml.decode(f.read(), type=cls)
 
     @classmethod
-    def from_logs(cls, variant: str, seed: int, players: List[str], logs: List[TurnLog]):
+    def from_logs(cls, variant: str, seed: int, players: List[str], logs: GameLogs):
         if len(logs) == 0:
             raise ValueError("Logs are empty")
         config = logs[0].data.config
@@ -0,0 +1,256 @@
+import mmap
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import msgspec
+from msgspec import Struct
+
+from hanapy.contrib.bots import BOTS
+from hanapy.core.loop import TurnLog, TurnLogSink
+from hanapy.runtime.simulation import SimulationResult, play_game
+from hanapy.utils.ser import dumps, get_decoder
+
+MAGIC = b"HNPYARC1"
+# index offset and magic at the end of the file
+FOOTER = struct.Struct(">Q8s")
+
+
+class BlockEntry(Struct, array_like=True):
+    offset: int
+    size: int
+
+
+class GameEntry(Struct):
+    game_id: str
+    variant: str
+    seed: Optional[int]
+    first_turn: int
+    turns: int
+    block_turns: int
+    blocks: List[BlockEntry]
+
+    def locate(self, turn: int) -> Tuple[int, int]:
+        """Block index and position in the block of the turn"""
+        index = turn - self.first_turn
+        if not 0 <= index < self.turns:
+            raise KeyError(f"No turn {turn} in game {self.game_id}")
+        return divmod(index, self.block_turns)
+
+
+class ArchiveIndex(Struct):
+    games: List[GameEntry] = msgspec.field(default_factory=list)
+
+
+class ArchivedGame(Struct):
+    """Turns of one game compressed in blocks, not yet written to an archive"""
+
+    game_id: str
+    variant: str
+    seed: Optional[int]
+    first_turn: int
+    turns: int
+    block_turns: int
+    blocks: List[bytes]
+
+
+class GameRecorder(TurnLogSink):
+    """Compresses every block_turns turns of the game into a block as soon as they are played"""
+
+    def __init__(self, game_id: str, variant: str, seed: Optional[int], block_turns: int = 8, level: int = 6):
+        self.game = ArchivedGame(
+            game_id=game_id, variant=variant, seed=seed, first_turn=0, turns=0, block_turns=block_turns, blocks=[]
+        )
+        self.level = level
+        self._pending: List[bytes] = []
+
+    def write(self, log: TurnLog) -> None:
+        if self.game.turns == 0:
+            self.game.first_turn = log.turn
+        elif log.turn != self.game.first_turn + self.game.turns:
+            raise ValueError(f"Turn {log.turn} is out of order in game {self.game.game_id}")
+        # encoded right away, game data in the log changes after this call
+        self._pending.append(dumps(log, msgspec.msgpack))
+        self.game.turns += 1
+        if len(self._pending) == self.game.block_turns:
+            self._compress()
+
+    def _compress(self) -> None:
+        # block is a msgpack array of turn logs, built from already encoded items
+        header = msgspec.msgpack.encode([None] * len(self._pending))
+        block = header[: -len(self._pending)] + b"".join(self._pending)
+        self.game.blocks.append(zlib.compress(block, self.level))
+        self._pending.clear()
+
+    def finish(self) -> ArchivedGame:
+        if self._pending:
+            self._compress()
+        return self.game
+
+
+class ArchiveWriter:
+    """Writes games to an archive file, appending to it if it already exists.
+
+    File is the magic, compressed blocks of games, index of all games (msgpack) and the footer
+    with index offset. New games and index are appended after the last footer, so until close
+    the file still ends with the previous index and reader finds it even if writing is interrupted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index = ArchiveIndex()
+        self._file: BinaryIO
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with ArchiveReader(path) as reader:
+                self.index = reader.index
+                end = reader.end
+            self._file = open(path, "r+b")  # noqa: SIM115
+            # anything after the last footer is left from an interrupted write
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "wb")  # noqa: SIM115
+            self._file.write(MAGIC)
+            self._write_index()
+        self.game_ids = {game.game_id for game in self.index.games}
+
+    def _write_index(self) -> None:
+        index_offset = self._file.tell()
+        self._file.write(msgspec.msgpack.encode(self.index))
+        self._file.write(FOOTER.pack(index_offset, MAGIC))
+        self._file.flush()
+
+    def add(self, game: ArchivedGame) -> None:
+        if game.game_id in self.game_ids:
+            raise ValueError(f"Game {game.game_id} is already in the archive")
+        blocks = []
+        for block in game.blocks:
+            blocks.append(BlockEntry(offset=self._file.tell(), size=len(block)))
+            self._file.write(block)
+        self.index.games.append(
+            GameEntry(
+                game_id=game.game_id,
+                variant=game.variant,
+                seed=game.seed,
+                first_turn=game.first_turn,
+                turns=game.turns,
+                block_turns=game.block_turns,
+                blocks=blocks,
+            )
+        )
+        self.game_ids.add(game.game_id)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._write_index()
+        self._file.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ArchiveReader:
+    """Random access to turns of archived games through memory mapped file. Only the block with the turn is read"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a game archive")
+        found = self._find_index()
+        if found is None:
+            self._mmap.close()
+            raise ValueError(f"{path} has no complete game index")
+        self.index, self.index_offset, self.end = found
+        self.games: Dict[str, GameEntry] = {game.game_id: game for game in self.index.games}
+
+    def _find_index(self) -> Optional[Tuple[ArchiveIndex, int, int]]:
+        """Last valid index with its offset and the end of its footer. Normally the footer is at the end of the file,
+        after an interrupted write it is searched for backwards"""
+        end = len(self._mmap)
+        while end >= len(MAGIC) + FOOTER.size:
+            index_offset, magic = FOOTER.unpack_from(self._mmap, end - FOOTER.size)
+            if magic == MAGIC and len(MAGIC) <= index_offset <= end - FOOTER.size:
+                try:
+                    index_data = self._mmap[index_offset : end - FOOTER.size]
+                    return msgspec.msgpack.decode(index_data, type=ArchiveIndex), index_offset, end
+                except msgspec.DecodeError:
+                    pass
+            end = self._mmap.rfind(MAGIC, 0, end - 1) + len(MAGIC)
+        return None
+
+    def find(self, seed: Optional[int] = None, variant: Optional[str] = None) -> List[GameEntry]:
+        return [
+            game
+            for game in self.index.games
+            if (seed is None or game.seed == seed) and (variant is None or game.variant == variant)
+        ]
+
+    def read_block(self, game: GameEntry, block: int) -> List[TurnLog]:
+        entry = game.blocks[block]
+        data = zlib.decompress(self._mmap[entry.offset : entry.offset + entry.size])
+        logs: List[TurnLog] = get_decoder(List[TurnLog], msgspec.msgpack).decode(data)
+        return logs
+
+    def get_turn(self, game_id: str, turn: int) -> TurnLog:
+        game = self.games[game_id]
+        block, pos = game.locate(turn)
+        return self.read_block(game, block)[pos]
+
+    def iter_game(self, game_id: str) -> Iterator[TurnLog]:
+        game = self.games[game_id]
+        for block in range(len(game.blocks)):
+            yield from self.read_block(game, block)
+
+    def __len__(self):
+        return len(self.index.games)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def get_game_id(variant: str, bots: Sequence[str], seed: int) -> str:
+    return f"{variant}:{','.join(bots)}:{seed}"
+
+
+def record_game(variant: str, bots: Sequence[str], seed: int) -> Tuple[SimulationResult, ArchivedGame]:
+    recorder = GameRecorder(get_game_id(variant, bots, seed), variant, seed)
+    players = [BOTS[bot](f"[{i}]{bot}") for i, bot in enumerate(bots)]
+    result = play_game(variant, players, seed, log_sinks=[recorder])
+    return result, recorder.finish()
+
+
+def _record_game_args(args) -> Tuple[SimulationResult, ArchivedGame]:
+    return record_game(*args)
+
+
+def simulate_to_archive(
+    path: str, variant: str, bots: Sequence[str], seeds: Iterable[int], workers: int = 1, chunksize: int = 16
+) -> Iterator[SimulationResult]:
+    """Same as simulate, but turns of every game are also written to the archive. Games are compressed in workers"""
+    tasks = ((variant, list(bots), seed) for seed in seeds)
+    with ArchiveWriter(path) as writer:
+        if workers <= 1:
+            games: Iterable[Tuple[SimulationResult, ArchivedGame]] = map(_record_game_args, tasks)
+            for result, game in games:
+                writer.add(game)
+                yield result
+            return
+        with ProcessPoolExecutor(workers) as executor:
+            for result, game in executor.map(_record_game_args, tasks, chunksize=chunksize):
+                writer.add(game)
+                yield result
@@ -1,13 +1,20 @@
 import asyncio
 import logging
 from asyncio import StreamReader, StreamWriter
-from typing import Optional
+from typing import Dict, Optional, Sequence
 
 from hanapy.runtime.base import HostPortMixin
 from hanapy.runtime.buffers import BufferingHanapyClient, BufferingHanapyServer
-from hanapy.runtime.events import ConnectionLostEvent, Event, MessageEvent, PlayerRegisteredEvent
+from hanapy.runtime.events import (
+    ConnectionLostEvent,
+    Event,
+    MessageEvent,
+    PlayerRegisteredEvent,
+    RegisterPlayerEvent,
+    WireFormatEvent,
+)
+from hanapy.runtime.wire import DEFAULT_WIRE_FORMAT, JSON, MSGPACK, WIRE_FORMATS, WireFormat, negotiate
 from hanapy.types import PlayerID
-from hanapy.utils.ser import dumps, loads
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +33,7 @@ class AsyncServer(HostPortMixin, BufferingHanapyServer[StreamWriter]):
 
     def __init__(self, host: str, port: int):
         super().__init__(host, port)
+        self.wire_formats: Dict[StreamWriter, WireFormat] = {}
         self.add_event_handler(ConnectionLostEvent, self.player_disconnected_handler)
 
     def player_disconnected_handler(self, event: ConnectionLostEvent):
@@ -33,14 +41,26 @@ class AsyncServer(HostPortMixin, BufferingHanapyServer[StreamWriter]):
         return False
 
     async def send(self, client: StreamWriter, event: Event):
-        data = dumps(event) + b"\n"
+        data = self.wire_formats.get(client, DEFAULT_WIRE_FORMAT).encode(event)
         logger.debug("[server] sending event %s", event)
         client.write(data)
 
     async def player_connected_handler(self, reader: StreamReader, writer: StreamWriter):
         logger.debug("[server] new player connected")
-        register_event = loads(Event, await reader.readline())
+        data = await DEFAULT_WIRE_FORMAT.read(reader)
+        if data is None:
+            return
+        register_event = DEFAULT_WIRE_FORMAT.decode(data)
         pid = register_event.pid
+        offered: Sequence[str] = ()
+        if isinstance(register_event, RegisterPlayerEvent):
+            offered = register_event.formats
+            if register_event.delta_updates:
+                self.delta_players.add(pid)
+        wire_format = negotiate(offered)
+        logger.debug("[server] using %s wire format for %s", wire_format.name, pid)
+        writer.write(DEFAULT_WIRE_FORMAT.encode(WireFormatEvent(pid=pid, format=wire_format.name)))
+        self.wire_formats[writer] = wire_format
         self.register_player(pid, writer)
         await self.broadcast(PlayerRegisteredEvent(pid=pid, player_num=self.player_num, players=self.list_players()))
         self.player_num += 1
@@ -48,13 +68,14 @@ class AsyncServer(HostPortMixin, BufferingHanapyServer[StreamWriter]):
         async def listen_for_events():
             listening = True
             while listening:
-                data = await reader.readline()
-                if not data:
+                data = await wire_format.read(reader)
+                if data is None:
                     listening = False
                     event: Event = ConnectionLostEvent(pid=pid)
                     self.unregister_player(pid)
+                    del self.wire_formats[writer]
                 else:
-                    event = loads(Event, data)
+                    event = wire_format.decode(data)
                 await self.receive_event(event)
 
         listen_for_events.__name__ = f"listen_for_events{pid}]"
@@ -68,8 +89,12 @@ class AsyncServer(HostPortMixin, BufferingHanapyServer[StreamWriter]):
 
 
 class AsyncClient(HostPortMixin, BufferingHanapyClient):
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, wire_formats: Sequence[str] = (MSGPACK, JSON), delta_updates: bool = True):
         super().__init__(host, port)
+        self.wire_formats = tuple(wire_formats)
+        self.delta_updates = delta_updates
+        # registration is sent as json, server answers with the format to use for everything else
+        self.wire_format = DEFAULT_WIRE_FORMAT
         self.writer: Optional[StreamWriter] = None
         self.listening = True
 
@@ -86,13 +111,17 @@ class AsyncClient(HostPortMixin, BufferingHanapyClient):
 
         async def listen_for_events():
             while self.listening:
-                data = await reader.readline()
-                if not data:
+                data = await self.wire_format.read(reader)
+                if data is None:
                     logger.debug("Connection to server lost, exiting loop")
                     event: Event = ConnectionLostEvent(pid="")
                     self.listening = False
                 else:
-                    event = loads(Event, data)
+                    event = self.wire_format.decode(data)
+                    if isinstance(event, WireFormatEvent):
+                        logger.debug("[client] using %s wire format", event.format)
+                        self.wire_format = WIRE_FORMATS[event.format]
+                        continue
                 await self.receive_event(event)
 
         get_event_loop().create_task(listen_for_events())
@@ -109,5 +138,5 @@ class AsyncClient(HostPortMixin, BufferingHanapyClient):
 
     async def send_event(self, event: Event):
         logger.debug("[client] sending event %s", event)
-        data = dumps(event) + b"\n"
+        data = self.wire_format.encode(event)
         self.writer.write(data)  # type: ignore[union-attr]
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Type, Union
+from typing import Dict, List, Optional, Set, Tuple, Type, Union
 
 from hanapy.core.loop import GameVariant, RandomSeed
 from hanapy.runtime.events import (
@@ -12,6 +12,7 @@ from hanapy.runtime.events import (
     StartGameEvent,
     call_handler,
 )
+from hanapy.runtime.logs import StreamingLogSink, get_log_format
 from hanapy.types import ET, EventHandlers, PlayerID
 
 DEFAULT_HOST = "127.0.0.1"
@@ -36,15 +37,20 @@ class HanapyBase(ABC):
             for h in handlers:
                 self.add_event_handler(event_type, h)
 
-    async def receive_event(self, event: Event):
+    async def handle_event(self, event: Event) -> bool:
+        """Runs handlers of the event, False if one of them stopped propagating it"""
         for event_type, handlers in self.event_handlers.items():
             if isinstance(event, event_type):
                 for handler in handlers:
                     logger.debug(f"Handling {event} with {handler}")
                     if not await call_handler(handler, event):
                         logger.debug(f"Stopped propagating {event}")
-                        return
-        await self._receive_event(event)
+                        return False
+        return True
+
+    async def receive_event(self, event: Event):
+        if await self.handle_event(event):
+            await self._receive_event(event)
 
     @abstractmethod
     async def _receive_event(self, event: Event):
@@ -52,6 +58,13 @@ class HanapyBase(ABC):
 
 
 class HanapyServer(HanapyBase):
+    def __init__(self, event_handlers: Optional[EventHandlers] = None):
+        super().__init__(event_handlers)
+        # players that registered with delta updates
+        self.delta_players: Set[PlayerID] = set()
+        # full view is sent with every n-th delta event, 0 to send it only when client asks for it
+        self.resync_every = 0
+
     @abstractmethod
     async def wait_for_event(self, pid: PlayerID, event_type: Type[ET]) -> ET:
         raise NotImplementedError
@@ -77,9 +90,17 @@ class HanapyServer(HanapyBase):
         from hanapy.runtime.players import ServerPlayerActor
 
         await self.wait_for_event(host_pid, StartGameEvent)
-        players = [ServerPlayerActor(uid, self) for uid in self.list_players()]
+        players = [
+            ServerPlayerActor(uid, self, delta_updates=uid in self.delta_players, resync_every=self.resync_every)
+            for uid in self.list_players()
+        ]
         game = game_variant(players, random_seed)
         loop = game.get_loop()
+        if log_file is not None and get_log_format(log_file) is not None:
+            with StreamingLogSink(log_file) as log_sink:
+                loop.add_log_sink(log_sink)
+                await loop.run()
+            return
         await loop.run()
         if log_file is not None:
             loop.save_logs(log_file, False, "", "", "")  # todo
@@ -93,10 +114,12 @@ class HanapyServer(HanapyBase):
 
 class HanapyClient(HanapyBase):
     me: int
+    wire_formats: Tuple[str, ...] = ("json",)
+    delta_updates: bool = False
 
     async def register(self, pid: PlayerID) -> int:
         logger.debug("[client] registering self %s", pid)
-        await self.send_event(RegisterPlayerEvent(pid=pid))
+        await self.send_event(RegisterPlayerEvent(pid=pid, formats=self.wire_formats, delta_updates=self.delta_updates))
         return (await self.wait_for_event(PlayerRegisteredEvent)).player_num
 
     @abstractmethod
@@ -0,0 +1,247 @@
+import platform
+import time
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import msgspec
+from msgspec import Struct
+
+from hanapy.contrib.bots import BOTS
+from hanapy.core.loop import TurnLog
+from hanapy.core.player import PlayerView, as_sync_player
+from hanapy.runtime.events import ActionEvent, Event, ObserveUpdateEvent, WaitForActionEvent
+from hanapy.runtime.simulation import run_game
+from hanapy.utils.ser import dumps, loads
+from hanapy.variants import VARIANTS
+
+# runs the measured code once, returns number of operations and seconds spent on them
+Measured = Callable[[], Tuple[int, float]]
+
+
+class BenchResult(Struct):
+    name: str
+    unit: str
+    ops: int
+    seconds: float
+    # operations per second
+    rate: float
+
+
+class BenchReport(Struct):
+    meta: Dict[str, str]
+    results: List[BenchResult]
+
+    def get(self, name: str) -> Optional[BenchResult]:
+        return next((r for r in self.results if r.name == name), None)
+
+    def to_json(self) -> bytes:
+        return msgspec.json.format(msgspec.json.encode(self), indent=2)
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "BenchReport":
+        return msgspec.json.decode(data, type=BenchReport)
+
+
+class BenchComparison(Struct):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline > 0 else 0.0
+
+
+def measure(name: str, unit: str, func: Measured, min_time: float) -> BenchResult:
+    ops, seconds = 0, 0.0
+    while seconds < min_time:
+        run_ops, run_seconds = func()
+        ops += run_ops
+        seconds += run_seconds
+    return BenchResult(name=name, unit=unit, ops=ops, seconds=seconds, rate=ops / seconds if seconds > 0 else 0.0)
+
+
+def timed(func: Callable[[], int]) -> Measured:
+    def wrapper():
+        start = time.perf_counter()
+        ops = func()
+        return ops, time.perf_counter() - start
+
+    return wrapper
+
+
+def record_game(variant: str, bot: str, players: int, seed: int = 0) -> List[TurnLog]:
+    loop = VARIANTS[variant]([BOTS[bot](f"[{i}]{bot}") for i in range(players)], seed).get_loop()
+    loop.run_sync()
+    return loop.logs  # type: ignore[return-value]
+
+
+def bench_loop(variant: str, bot: str, players: int) -> Measured:
+    seeds = iter(range(2**31))
+
+    def run():
+        return run_game(variant, [bot] * players, next(seeds)).turns
+
+    return timed(run)
+
+
+def bench_player_view(logs: List[TurnLog]) -> Measured:
+    datas = [log.data for log in logs]
+
+    def run():
+        for data in datas:
+            for player in range(len(data.players)):
+                data.get_player_view(player)
+        return len(datas) * len(datas[0].players)
+
+    return timed(run)
+
+
+def bench_refresh_card_info(logs: List[TurnLog]) -> Measured:
+    views = [(log.data.get_current_player_view(), log.data.state) for log in logs]
+
+    def run():
+        # refreshing changes card info, so every run starts from copies of not refreshed game state
+        fresh = [msgspec.structs.replace(view, state=state.copy()) for view, state in views]
+        start = time.perf_counter()
+        for view in fresh:
+            view.refresh_card_info()
+        return len(fresh), time.perf_counter() - start
+
+    return run
+
+
+def get_events(logs: List[TurnLog]) -> Dict[str, List[Event]]:
+    events: Dict[str, List[Event]] = {"wait_for_action": [], "action": [], "observe_update": []}
+    for log, next_log in zip(logs, logs[1:]):
+        view = log.data.get_current_player_view()
+        new_view = next_log.data.get_player_view(log.data.state.current_player)
+        events["wait_for_action"].append(WaitForActionEvent(pid="bench", view=view))
+        events["action"].append(ActionEvent(pid="bench", action=log.action))
+        events["observe_update"].append(
+            ObserveUpdateEvent(pid="bench", view=view, new_view=new_view, update=log.update)
+        )
+    return events
+
+
+def bench_dumps(events: Sequence[Event]) -> Measured:
+    def run():
+        for event in events:
+            dumps(event)
+        return len(events)
+
+    return timed(run)
+
+
+def bench_loads(events: Sequence[Event]) -> Measured:
+    payloads = [dumps(event) for event in events]
+
+    def run():
+        for payload in payloads:
+            loads(Event, payload)
+        return len(payloads)
+
+    return timed(run)
+
+
+def bench_decision(bot: str, logs: List[TurnLog]) -> Measured:
+    player = as_sync_player(BOTS[bot](bot))
+    views: List[PlayerView] = [log.data.get_current_player_view() for log in logs]
+
+    def run():
+        for view in views:
+            player.get_next_action_sync(view)
+        return len(views)
+
+    return timed(run)
+
+
+class RecordedGames:
+    """Lazily recorded games and events that benchmarks use as inputs"""
+
+    def __init__(self, variant: str, players: int):
+        self.variant = variant
+        self.players = players
+        self.logs: Dict[str, List[TurnLog]] = {}
+        self.events: Dict[str, Dict[str, List[Event]]] = {}
+
+    def get_logs(self, bot: str) -> List[TurnLog]:
+        if bot not in self.logs:
+            self.logs[bot] = record_game(self.variant, bot, self.players)
+        return self.logs[bot]
+
+    def get_events(self, bot: str, typename: str) -> List[Event]:
+        if bot not in self.events:
+            self.events[bot] = get_events(self.get_logs(bot))
+        return self.events[bot][typename]
+
+    def player_view(self, bot: str) -> Measured:
+        return bench_player_view(self.get_logs(bot))
+
+    def refresh_card_info(self, bot: str) -> Measured:
+        return bench_refresh_card_info(self.get_logs(bot))
+
+    def dumps(self, bot: str, typename: str) -> Measured:
+        return bench_dumps(self.get_events(bot, typename))
+
+    def loads(self, bot: str, typename: str) -> Measured:
+        return bench_loads(self.get_events(bot, typename))
+
+    def decision(self, bot: str) -> Measured:
+        return bench_decision(bot, self.get_logs(bot))
+
+
+def iter_benchmarks(
+    variant: str, bots: Sequence[str], players: int
+) -> Iterator[Tuple[str, str, Callable[[], Measured]]]:
+    """Yield name, unit and benchmark factory, so setup of filtered out benchmarks is skipped"""
+    games = RecordedGames(variant, players)
+    main_bot = bots[0]
+    for bot in bots:
+        yield f"loop/{variant}/{bot}", "turns/s", partial(bench_loop, variant, bot, players)
+    yield f"player_view/{variant}", "views/s", partial(games.player_view, main_bot)
+    yield f"refresh_card_info/{variant}", "views/s", partial(games.refresh_card_info, main_bot)
+    for typename in ["wait_for_action", "action", "observe_update"]:
+        yield f"dumps/{typename}", "events/s", partial(games.dumps, main_bot, typename)
+        yield f"loads/{typename}", "events/s", partial(games.loads, main_bot, typename)
+    for bot in bots:
+        yield f"decision/{variant}/{bot}", "actions/s", partial(games.decision, bot)
+
+
+def run_benchmarks(
+    variant: str,
+    bots: Sequence[str],
+    players: int = 2,
+    min_time: float = 1.0,
+    only: Optional[str] = None,
+    callback: Optional[Callable[[BenchResult], None]] = None,
+) -> BenchReport:
+    results = []
+    for name, unit, factory in iter_benchmarks(variant, bots, players):
+        if only is not None and only not in name:
+            continue
+        result = measure(name, unit, factory(), min_time)
+        if callback is not None:
+            callback(result)
+        results.append(result)
+    meta = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "msgspec": msgspec.__version__,
+        "players": str(players),
+    }
+    return BenchReport(meta=meta, results=results)
+
+
+def compare(report: BenchReport, baseline: BenchReport) -> List[BenchComparison]:
+    comparisons = []
+    for result in report.results:
+        base = baseline.get(result.name)
+        if base is not None:
+            comparisons.append(BenchComparison(name=result.name, baseline=base.rate, current=result.rate))
+    return comparisons
+
+
+def get_regressions(comparisons: Sequence[BenchComparison], tolerance: float) -> List[BenchComparison]:
+    return [c for c in comparisons if c.change < -tolerance]
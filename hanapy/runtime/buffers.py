@@ -1,7 +1,8 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Awaitable, Callable, Dict, Generic, List, Optional, Type, TypeVar
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar
 
 from hanapy.runtime.base import EventHandlers, HanapyClient, HanapyServer
 from hanapy.runtime.events import Event
@@ -19,39 +20,141 @@ class EventWaitAborted(Exception):
     pass
 
 
+class EventBufferOverflow(Exception):
+    pass
+
+
+# what to do with a new event when the buffer is full
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+RAISE = "raise"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, RAISE)
+
+# events are numbered, so the oldest one can be found among queues of different types
+EventQueue = Deque[Tuple[int, Event]]
+
+
 class EventBuffer:
-    def __init__(self):
-        self._buf: List[Event] = []
+    """Events that were not consumed yet. Waiters get the matching event as soon as it is added.
+
+    Breaker is only checked every breaker_interval seconds, events are never polled for.
+    Events are kept in a queue per event type, lookup takes the oldest event among queues of matching types.
+    With capacity set, overflow policy decides what happens to the event that does not fit.
+    """
+
+    def __init__(self, breaker_interval: float = 0.1, capacity: Optional[int] = None, overflow: str = DROP_OLDEST):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow}, use one of {OVERFLOW_POLICIES}")
+        if capacity is not None and capacity < 1:
+            raise ValueError("Buffer capacity should be positive")
+        self.breaker_interval = breaker_interval
+        self.capacity = capacity
+        self.overflow = overflow
+        self._queues: Dict[Type[Event], EventQueue] = {}
+        # queues of all event types that are instances of the requested type
+        self._matching: Dict[Type[Event], List[EventQueue]] = {}
+        self._waiters: List[Tuple[Type[Event], asyncio.Future[Event]]] = []
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _get_queue(self, event_cls: Type[Event]) -> EventQueue:
+        queue = self._queues.get(event_cls)
+        if queue is None:
+            queue = self._queues[event_cls] = deque()
+            for event_type, queues in self._matching.items():
+                if issubclass(event_cls, event_type):
+                    queues.append(queue)
+        return queue
+
+    def _get_matching(self, event_type: Type[Event]) -> List[EventQueue]:
+        queues = self._matching.get(event_type)
+        if queues is None:
+            queues = self._matching[event_type] = [q for cls, q in self._queues.items() if issubclass(cls, event_type)]
+        return queues
+
+    def _pop_oldest(self, queues: Iterable[EventQueue]) -> Optional[Event]:
+        oldest: Optional[EventQueue] = None
+        for queue in queues:
+            if queue and (oldest is None or queue[0][0] < oldest[0][0]):
+                oldest = queue
+        if oldest is None:
+            return None
+        self._size -= 1
+        return oldest.popleft()[1]
 
     def add(self, event: Event):
-        self._buf.append(event)
+        for i, (event_type, future) in enumerate(self._waiters):
+            if isinstance(event, event_type) and not future.done():
+                del self._waiters[i]
+                future.set_result(event)
+                return
+        if self.capacity is not None and self._size >= self.capacity:
+            if self.overflow == RAISE:
+                raise EventBufferOverflow(f"Buffer is full with {self._size} events, can't add {event}")
+            if self.overflow == DROP_NEWEST:
+                logger.warning("buffer is full, dropping new event %s", event)
+                return
+            logger.warning("buffer is full, dropping old event %s", self._pop_oldest(self._queues.values()))
+        self._get_queue(type(event)).append((self._next, event))
+        self._next += 1
+        self._size += 1
 
     def search_event(self, event_type: Type[ET]) -> Optional[ET]:
-        for i, event in enumerate(self._buf):
-            if isinstance(event, event_type):
-                return self._buf.pop(i)  # type: ignore[return-value]
-        return None
+        return self._pop_oldest(self._get_matching(event_type))  # type: ignore[return-value]
 
     async def wait_for_event(self, event_type: Type[ET], breaker: Optional[Callable[[], Awaitable[bool]]] = None) -> ET:
         event = self.search_event(event_type)
-        while event is None:
-            if breaker is not None and await breaker():
-                raise EventWaitAborted()
-            await asyncio.sleep(0.1)
-            event = self.search_event(event_type)
-        return event
+        if event is not None:
+            return event
+        future: asyncio.Future[Event] = asyncio.get_running_loop().create_future()
+        waiter: Tuple[Type[Event], asyncio.Future[Event]] = (event_type, future)
+        self._waiters.append(waiter)
+        try:
+            if breaker is None:
+                return await future  # type: ignore[return-value]
+            while not future.done() and not await breaker():
+                await asyncio.wait({future}, timeout=self.breaker_interval)
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # event was delivered to a waiter that is gone, give it to the next one
+                self.add(future.result())
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        if not future.done():
+            raise EventWaitAborted()
+        return future.result()  # type: ignore[return-value]
 
 
 class BufferingHanapyServer(HanapyServer, Generic[CT]):
+    # events that players send and game does not wait for can't pile up forever
+    buffer_capacity: Optional[int] = 1024
+    buffer_overflow: str = DROP_OLDEST
+
     def __init__(self, event_handlers: Optional[EventHandlers] = None):
         super().__init__(event_handlers)
         self.player_buffers: Dict[PlayerID, EventBuffer] = {}
         self.player_clients: Dict[PlayerID, CT] = {}
+        self._registration_waiters: Dict[PlayerID, List[asyncio.Future[None]]] = {}
 
     def register_player(self, pid: PlayerID, client: CT):
         logger.debug("[server] player registered %s %s", pid, client.__class__.__name__)
-        self.player_buffers[pid] = EventBuffer()
+        self.player_buffers[pid] = EventBuffer(capacity=self.buffer_capacity, overflow=self.buffer_overflow)
         self.player_clients[pid] = client
+        for future in self._registration_waiters.pop(pid, []):
+            if not future.done():
+                future.set_result(None)
+
+    async def wait_for_player(self, pid: PlayerID) -> EventBuffer:
+        while pid not in self.player_buffers:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._registration_waiters.setdefault(pid, []).append(future)
+            await future
+        return self.player_buffers[pid]
 
     def unregister_player(self, pid: PlayerID):
         logger.debug(
@@ -80,9 +183,8 @@ class BufferingHanapyServer(HanapyServer, Generic[CT]):
 
     async def wait_for_event(self, pid: PlayerID, event_type: Type[ET]) -> ET:
         logger.debug("[server] waiting for %s event from %s", event_type.__name__, pid)
-        while pid not in self.player_buffers:
-            await asyncio.sleep(0.1)
-        event = await self.player_buffers[pid].wait_for_event(event_type)
+        buffer = await self.wait_for_player(pid)
+        event = await buffer.wait_for_event(event_type)
         logger.debug("[server] got event %s from %s", event, pid)
         return event
 
@@ -1,4 +1,4 @@
-from typing import ClassVar, List
+from typing import ClassVar, List, Optional, Tuple
 
 from hanapy.core.action import Action, StateUpdate
 from hanapy.core.config import GameResult
@@ -43,6 +43,37 @@ class ObserveUpdateEvent(Event):
     update: StateUpdate
 
 
+# delta updates: client keeps a replica of its view and applies updates to it, server only sends checksums of views.
+# view is the full view before the update, sent every few turns to resync the replica
+
+
+class WaitForActionDeltaEvent(Event):
+    __typename__: ClassVar = "wait_for_action_delta"
+
+    checksum: int
+    view: Optional[PlayerView] = None
+
+
+class ObserveDeltaEvent(Event):
+    __typename__: ClassVar = "observe_delta"
+
+    update: StateUpdate
+    checksum: int
+    view: Optional[PlayerView] = None
+
+
+class ResyncRequestEvent(Event):
+    __typename__: ClassVar = "resync_request"
+
+
+class ResyncEvent(Event):
+    """Full view before the last delta event, answer to ResyncRequestEvent"""
+
+    __typename__: ClassVar = "resync"
+
+    view: PlayerView
+
+
 class UpdatePlayerMemoEvent(Event):
     __typename__: ClassVar = "update_player_memo"
     memo: PlayerMemo
@@ -50,6 +81,15 @@ class UpdatePlayerMemoEvent(Event):
 
 class RegisterPlayerEvent(Event):
     __typename__: ClassVar = "register_player"
+    # wire formats the client supports, in order of preference
+    formats: Tuple[str, ...] = ("json",)
+    # client keeps view replica and can handle delta events instead of full views
+    delta_updates: bool = False
+
+
+class WireFormatEvent(Event):
+    __typename__: ClassVar = "wire_format"
+    format: str
 
 
 class PlayerRegisteredEvent(Event):
@@ -0,0 +1,86 @@
+import os
+from typing import BinaryIO, Dict, List, Optional
+
+from hanapy.core.loop import TurnLog, TurnLogSink
+from hanapy.runtime.wire import JSON, MSGPACK, WIRE_FORMATS, WireFormat
+from hanapy.utils.ser import dumps, loads
+
+LOG_EXTENSIONS: Dict[str, str] = {".jsonl": JSON, ".msgpack": MSGPACK}
+
+
+def get_log_format(path: str) -> Optional[WireFormat]:
+    """Format of streamed log file by its extension, None if it is not a streamed log"""
+    name = LOG_EXTENSIONS.get(os.path.splitext(path)[1])
+    return WIRE_FORMATS[name] if name is not None else None
+
+
+def _get_log_format(path: str, wire_format: Optional[str]) -> WireFormat:
+    if wire_format is not None:
+        return WIRE_FORMATS[wire_format]
+    log_format = get_log_format(path)
+    if log_format is None:
+        raise ValueError(f"Unknown log format of {path}, use one of {list(LOG_EXTENSIONS)} extensions")
+    return log_format
+
+
+class StreamingLogSink(TurnLogSink):
+    """Appends turns to a file as JSON lines or length prefixed msgpack, depending on the extension.
+
+    Turns are encoded as soon as they are played and written in batches. Only complete records are written
+    with each batch, so the file can be read with LogTail while the game is still running.
+    Existing file is overwritten, one file holds one game.
+    """
+
+    def __init__(self, path: str, wire_format: Optional[str] = None, flush_every: int = 16):
+        self.path = path
+        self.wire_format = _get_log_format(path, wire_format)
+        self.flush_every = flush_every
+        self._buf: List[bytes] = []
+        self._file: Optional[BinaryIO] = open(path, "wb")  # noqa: SIM115
+
+    def write(self, log: TurnLog) -> None:
+        self._buf.append(self.wire_format.frame(dumps(log, self.wire_format.module)))
+        if len(self._buf) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is None:
+            raise ValueError(f"Log {self.path} is closed")
+        if self._buf:
+            self._file.write(b"".join(self._buf))
+            self._buf.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "StreamingLogSink":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class LogTail:
+    """Reads turns from a streamed log file, including the one that is still being written"""
+
+    def __init__(self, path: str, wire_format: Optional[str] = None):
+        self.path = path
+        self.wire_format = _get_log_format(path, wire_format)
+        self.offset = 0
+
+    def read(self) -> List[TurnLog]:
+        """Turns written since the previous read. Incomplete last record is left for the next read"""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        payloads, size = self.wire_format.split(data)
+        self.offset += size
+        return [loads(TurnLog, payload, self.wire_format.module) for payload in payloads]
+
+
+def read_logs(path: str, wire_format: Optional[str] = None) -> List[TurnLog]:
+    return LogTail(path, wire_format).read()
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Optional, Type
+from typing import Optional, Tuple, Type
 
 import aioconsole
 
@@ -11,25 +11,56 @@ from hanapy.runtime.base import ET, HanapyClient, HanapyServer
 from hanapy.runtime.events import (
     ActionEvent,
     ActionVerificationEvent,
+    Event,
     GameEndedEvent,
     GameStartedEvent,
     MemoInitEvent,
+    ObserveDeltaEvent,
     ObserveUpdateEvent,
     PlayerRegisteredEvent,
+    ResyncEvent,
+    ResyncRequestEvent,
     StartGameEvent,
     UpdatePlayerMemoEvent,
+    WaitForActionDeltaEvent,
     WaitForActionEvent,
 )
+from hanapy.runtime.replica import ViewReplica, get_view_checksum
 from hanapy.types import PlayerID
 
 logger = logging.getLogger(__name__)
 
 
 class ServerPlayerActor(PlayerActor):
-    def __init__(self, pid: PlayerID, server: HanapyServer):
+    def __init__(self, pid: PlayerID, server: HanapyServer, delta_updates: bool = False, resync_every: int = 0):
         super().__init__(pid)
         self.pid = pid
         self.server = server
+        self.delta_updates = delta_updates
+        self.resync_every = resync_every
+        self.deltas_sent = 0
+        # view before the last delta event
+        self.synced_view: Optional[PlayerView] = None
+        if delta_updates:
+            server.add_event_handler(ResyncRequestEvent, self.resync_request_handler)
+
+    async def resync_request_handler(self, event: ResyncRequestEvent) -> bool:
+        if event.pid != self.pid:
+            return True
+        if self.synced_view is None:
+            # clients only ask after a delta update, raising here would stop listening to a misbehaving one
+            logger.warning("[server] %s asked to resync before any delta update was sent, ignoring", self.pid)
+            return False
+        logger.debug("[server] resyncing view of %s", self.pid)
+        await self.server.send_event(self.pid, ResyncEvent(pid=self.pid, view=self.synced_view))
+        return False
+
+    def get_resync_view(self, view: PlayerView) -> Optional[PlayerView]:
+        self.synced_view = view
+        self.deltas_sent += 1
+        if self.resync_every > 0 and self.deltas_sent % self.resync_every == 0:
+            return view
+        return None
 
     async def on_game_start(self, view: PlayerView) -> PlayerMemo:
         await self.server.send_event(self.pid, GameStartedEvent(pid=self.pid, view=view))
@@ -39,13 +70,23 @@ class ServerPlayerActor(PlayerActor):
         return await self.server.wait_for_event(self.pid, event_type)
 
     async def get_next_action(self, view: PlayerView) -> Action:
-        await self.server.send_event(self.pid, WaitForActionEvent(pid=self.pid, view=view))
+        if self.delta_updates:
+            checksum = get_view_checksum(view)
+            event: Event = WaitForActionDeltaEvent(pid=self.pid, checksum=checksum, view=self.get_resync_view(view))
+        else:
+            event = WaitForActionEvent(pid=self.pid, view=view)
+        await self.server.send_event(self.pid, event)
         return (await self.wait_for_event_type(ActionEvent)).action
 
     async def observe_update(self, view: PlayerView, update: StateUpdate, new_view: PlayerView) -> PlayerMemo:
-        await self.server.send_event(
-            self.pid, ObserveUpdateEvent(pid=self.pid, view=view, new_view=new_view, update=update)
-        )
+        if self.delta_updates:
+            checksum = get_view_checksum(new_view)
+            event: Event = ObserveDeltaEvent(
+                pid=self.pid, update=update, checksum=checksum, view=self.get_resync_view(view)
+            )
+        else:
+            event = ObserveUpdateEvent(pid=self.pid, view=view, new_view=new_view, update=update)
+        await self.server.send_event(self.pid, event)
         return (await self.wait_for_event_type(UpdatePlayerMemoEvent)).memo
 
     async def on_game_end(self, view: PlayerView, game_result: GameResult):
@@ -66,12 +107,52 @@ class ClientPlayerProxy:
         self.player_num: int = -1
         self.player_count = 1
         self.running = True
+        self.replica: Optional[ViewReplica] = None
 
     async def observe(self):
-        observe = await self.client.wait_for_event(ObserveUpdateEvent)
-        memo = await self.player.observe_update(observe.view, observe.update, observe.new_view)
+        if self.replica is not None:
+            delta = await self.client.wait_for_event(ObserveDeltaEvent)
+            view, new_view = await self.sync_replica(self.replica, delta.view, delta.checksum, delta.update)
+            # handlers of full updates get them with views from the replica
+            await self.client.handle_event(
+                ObserveUpdateEvent(pid=self.pid, view=view, new_view=new_view, update=delta.update)
+            )
+            memo = await self.player.observe_update(view, delta.update, new_view)
+            self.replica.set_memo(memo)
+            self.replica.next_turn()
+        else:
+            observe = await self.client.wait_for_event(ObserveUpdateEvent)
+            memo = await self.player.observe_update(observe.view, observe.update, observe.new_view)
         await self.client.send_event(UpdatePlayerMemoEvent(pid=self.pid, memo=memo))
 
+    async def wait_for_action(self) -> PlayerView:
+        if self.replica is not None:
+            delta = await self.client.wait_for_event(WaitForActionDeltaEvent)
+            view, _ = await self.sync_replica(self.replica, delta.view, delta.checksum)
+            await self.client.handle_event(WaitForActionEvent(pid=self.pid, view=view))
+            return view
+        return (await self.client.wait_for_event(WaitForActionEvent)).view
+
+    async def sync_replica(
+        self, replica: ViewReplica, view: Optional[PlayerView], checksum: int, update: Optional[StateUpdate] = None
+    ) -> Tuple[PlayerView, PlayerView]:
+        """Views before and after the update, taken from the replica. Replica is resynced if it does not match"""
+        if view is not None:
+            replica.reset(view)
+        old_view = replica.get_view()
+        if update is not None:
+            replica.apply(update)
+        if replica.checksum() != checksum:
+            logger.debug("[client] view replica does not match server view, resyncing")
+            await self.client.send_event(ResyncRequestEvent(pid=self.pid))
+            replica.reset((await self.client.wait_for_event(ResyncEvent)).view)
+            old_view = replica.get_view()
+            if update is not None:
+                replica.apply(update)
+            if replica.checksum() != checksum:
+                raise RuntimeError("View replica does not match server view after resync")
+        return old_view, replica.get_view()
+
     async def game_ended_handler(self, event: GameEndedEvent) -> bool:
         await self.player.on_game_end(event.view, event.game_result)
         self.running = False
@@ -93,7 +174,11 @@ class ClientPlayerProxy:
         game_started_event = await self.client.wait_for_event(GameStartedEvent)
 
         self.client.add_event_handler(GameEndedEvent, self.game_ended_handler)
+        if self.client.delta_updates:
+            self.replica = ViewReplica(game_started_event.view)
         memo = await self.player.on_game_start(game_started_event.view)
+        if self.replica is not None:
+            self.replica.set_memo(memo)
         await self.client.send_event(MemoInitEvent(pid=self.pid, memo=memo))
         current_player = game_started_event.view.state.current_player
         player_count = game_started_event.view.config.player_count
@@ -102,10 +187,10 @@ class ClientPlayerProxy:
             while current_player != self.player_num:
                 await self.observe()
                 current_player = (current_player + 1) % player_count
-            wait = await self.client.wait_for_event(WaitForActionEvent)
+            view = await self.wait_for_action()
             success = False
             while not success:
-                action = await self.player.get_next_action(wait.view)
+                action = await self.player.get_next_action(view)
                 await self.client.send_event(ActionEvent(pid=self.pid, action=action))
                 verification = await self.client.wait_for_event(ActionVerificationEvent)
                 if verification.success:
@@ -0,0 +1,55 @@
+import zlib
+
+import msgspec
+from msgspec import structs
+
+from hanapy.core.action import StateUpdate
+from hanapy.core.player import PlayerMemo, PlayerView
+
+_encoder = msgspec.msgpack.Encoder()
+
+
+def get_view_checksum(view: PlayerView) -> int:
+    """Checksum of everything in the view that changes during the game, except the memo"""
+    return zlib.crc32(_encoder.encode((view.me, view.cards, view.state, view.visible)))
+
+
+def copy_view(view: PlayerView) -> PlayerView:
+    # memo is shared, like views of the same game data share it
+    return structs.replace(
+        view, cards=[list(cards) for cards in view.cards], state=view.state.copy(), visible=list(view.visible)
+    )
+
+
+class ViewReplica:
+    """Client copy of the player view, kept in sync by applying state updates instead of receiving full views.
+
+    Card info is refreshed after every update. Refreshing only removes cards that are seen everywhere,
+    and seen cards stay seen, so refreshed views stay equal to the ones server takes from game data.
+    """
+
+    def __init__(self, view: PlayerView):
+        self.view = copy_view(view)
+
+    def reset(self, view: PlayerView) -> None:
+        memo = self.view.memo
+        self.view = copy_view(view)
+        self.view.memo = memo
+
+    def get_view(self) -> PlayerView:
+        return copy_view(self.view)
+
+    def set_memo(self, memo: PlayerMemo) -> None:
+        self.view.memo = memo
+
+    def apply(self, update: StateUpdate) -> None:
+        update.apply_view(self.view)
+        self.view.refresh_card_info()
+
+    def next_turn(self) -> None:
+        state = self.view.state
+        state.turn += 1
+        state.current_player = (state.current_player + 1) % self.view.config.player_count
+
+    def checksum(self) -> int:
+        return get_view_checksum(self.view)
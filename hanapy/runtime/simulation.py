@@ -0,0 +1,83 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Sequence
+
+from msgspec import Struct
+
+from hanapy.contrib.bots import BOTS
+from hanapy.core.config import GameResult
+from hanapy.core.loop import TurnLogSink
+from hanapy.core.player import PlayerActor
+from hanapy.variants import VARIANTS
+
+
+class SimulationResult(Struct):
+    seed: int
+    turns: int
+    result: GameResult
+
+
+class SimulationStats(Struct):
+    games: int = 0
+    wins: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, result: GameResult) -> None:
+        # Welford's online algorithm, so stats can be streamed together with results
+        self.games += 1
+        self.wins += result.is_win
+        delta = result.score - self.mean
+        self.mean += delta / self.games
+        self.m2 += delta * (result.score - self.mean)
+
+    @property
+    def stddev(self) -> float:
+        if self.games < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.games - 1))
+
+    def confidence_interval(self, z: float = 1.96) -> float:
+        """Half width of the normal approximation confidence interval of the mean, 95% by default"""
+        if self.games < 2:
+            return math.inf
+        return z * self.stddev / math.sqrt(self.games)
+
+    @property
+    def win_rate(self) -> float:
+        if self.games == 0:
+            return 0.0
+        return self.wins / self.games
+
+    def __repr__(self):
+        return f"games={self.games} mean={self.mean:.3f} stddev={self.stddev:.3f} win_rate={self.win_rate:.3f}"
+
+
+def run_game(variant: str, bots: Sequence[str], seed: int) -> SimulationResult:
+    return play_game(variant, [BOTS[bot](f"[{i}]{bot}") for i, bot in enumerate(bots)], seed)
+
+
+def play_game(
+    variant: str, players: Sequence[PlayerActor], seed: int, log_sinks: Sequence[TurnLogSink] = ()
+) -> SimulationResult:
+    loop = VARIANTS[variant](players, seed).get_loop()
+    loop.use_compact_logs()
+    for sink in log_sinks:
+        loop.add_log_sink(sink)
+    loop.run_sync()
+    return SimulationResult(seed=seed, turns=loop.data.state.turn - 1, result=loop.data.get_game_result())
+
+
+def _run_game_args(args) -> SimulationResult:
+    return run_game(*args)
+
+
+def simulate(
+    variant: str, bots: Sequence[str], seeds: Iterable[int], workers: int = 1, chunksize: int = 16
+) -> Iterator[SimulationResult]:
+    tasks = ((variant, list(bots), seed) for seed in seeds)
+    if workers <= 1:
+        yield from map(_run_game_args, tasks)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(_run_game_args, tasks, chunksize=chunksize)
@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import combinations_with_replacement
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import msgspec
+from msgspec import Struct
+
+from hanapy.contrib.bots import BOTS
+from hanapy.core.config import GameResult
+from hanapy.core.player import Bot
+from hanapy.runtime.simulation import SimulationStats, play_game
+
+
+class Matchup(Struct, frozen=True):
+    variant: str
+    bots: Tuple[str, ...]
+
+    def __str__(self):
+        return f"{self.variant}:{','.join(self.bots)}"
+
+
+class MatchResult(Struct):
+    matchup: Matchup
+    seed: int
+    turns: int
+    result: GameResult
+
+
+# matchup, seed and bot factories in seat order
+MatchTask = Tuple[Matchup, int, Tuple[Bot, ...]]
+
+
+def run_match(task: MatchTask) -> MatchResult:
+    matchup, seed, bots = task
+    players = [bot(f"[{i}]{name}") for i, (name, bot) in enumerate(zip(matchup.bots, bots))]
+    game = play_game(matchup.variant, players, seed)
+    return MatchResult(matchup=matchup, seed=seed, turns=game.turns, result=game.result)
+
+
+def get_matchups(variants: Sequence[str], bots: Sequence[str], player_counts: Sequence[int]) -> List[Matchup]:
+    """Every combination of bots for every player count, ignoring seat order"""
+    return [
+        Matchup(variant=variant, bots=combination)
+        for variant in variants
+        for players in player_counts
+        for combination in combinations_with_replacement(bots, players)
+    ]
+
+
+class Tournament:
+    """Plays every matchup on the same seeds, so all of them get the same decks.
+
+    Results are appended to checkpoint file (JSON lines) as soon as they are ready,
+    and games that are already in it are skipped, so a killed tournament can be resumed.
+    """
+
+    def __init__(
+        self,
+        matchups: Sequence[Matchup],
+        seeds: Sequence[int],
+        checkpoint: Optional[str] = None,
+        bots: Optional[Dict[str, Bot]] = None,
+    ):
+        self.matchups = list(matchups)
+        self.seeds = list(seeds)
+        self.checkpoint = checkpoint
+        self.bots = {**BOTS, **(bots or {})}
+        self.results: List[MatchResult] = []
+
+    def load_checkpoint(self) -> None:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint, "rb+") as f:
+            data = f.read()
+            # last line can be cut if the run was killed while writing it
+            complete = data.rfind(b"\n") + 1
+            f.truncate(complete)
+        decoder = msgspec.json.Decoder(MatchResult)
+        self.results = [decoder.decode(line) for line in data[:complete].splitlines()]
+
+    def get_pending(self) -> Iterator[MatchTask]:
+        done: Set[Tuple[Matchup, int]] = {(r.matchup, r.seed) for r in self.results}
+        for seed in self.seeds:
+            for matchup in self.matchups:
+                if (matchup, seed) not in done:
+                    yield matchup, seed, tuple(self.bots[bot] for bot in matchup.bots)
+
+    def run(
+        self, workers: int = 1, chunksize: int = 4, callback: Optional[Callable[[MatchResult], None]] = None
+    ) -> List[MatchResult]:
+        self.load_checkpoint()
+        tasks = self.get_pending()
+        if workers <= 1:
+            self._collect(map(run_match, tasks), callback)
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                self._collect(executor.map(run_match, tasks, chunksize=chunksize), callback)
+        return self.results
+
+    def _collect(self, results: Iterable[MatchResult], callback: Optional[Callable[[MatchResult], None]]) -> None:
+        encoder = msgspec.json.Encoder()
+        with open(self.checkpoint, "ab") if self.checkpoint is not None else nullcontext() as f:
+            for result in results:
+                self.results.append(result)
+                if f is not None:
+                    f.write(encoder.encode(result) + b"\n")
+                    f.flush()
+                if callback is not None:
+                    callback(result)
+
+    def get_stats(self) -> Dict[Matchup, SimulationStats]:
+        stats: Dict[Matchup, SimulationStats] = {matchup: SimulationStats() for matchup in self.matchups}
+        seeds = set(self.seeds)
+        for result in self.results:
+            if result.matchup in stats and result.seed in seeds:
+                stats[result.matchup].add(result.result)
+        return stats
+
+    def get_table(self) -> str:
+        stats = self.get_stats()
+        width = max((len(str(m)) for m in stats), default=10)
+        lines = [f"{'matchup':<{width}} {'games':>6} {'mean':>7} {'95% ci':>8} {'stddev':>7} {'win rate':>8}"]
+        for matchup, s in sorted(stats.items(), key=lambda item: -item[1].mean):
+            lines.append(
+                f"{matchup!s:<{width}} {s.games:>6} {s.mean:>7.3f} {'±':>2}{s.confidence_interval():>6.3f}"
+                f" {s.stddev:>7.3f} {s.win_rate:>8.3f}"
+            )
+        return "\n".join(lines)
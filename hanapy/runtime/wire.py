@@ -0,0 +1,93 @@
+import struct
+from abc import ABC, abstractmethod
+from asyncio import IncompleteReadError, StreamReader
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+import msgspec
+
+from hanapy.runtime.events import Event
+from hanapy.utils.ser import dumps, loads
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+
+class WireFormat(ABC):
+    """Serialization and framing of events on a stream connection"""
+
+    name: ClassVar[str]
+    module: Any
+
+    def encode(self, event: Event) -> bytes:
+        return self.frame(dumps(event, self.module))
+
+    def decode(self, data: bytes) -> Event:
+        return loads(Event, data, self.module)
+
+    @abstractmethod
+    def frame(self, payload: bytes) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def read(self, reader: StreamReader) -> Optional[bytes]:
+        """Read next payload, None if connection is closed"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def split(self, data: bytes) -> Tuple[List[bytes], int]:
+        """Complete payloads at the start of data and the number of bytes they take"""
+        raise NotImplementedError
+
+
+class JsonLines(WireFormat):
+    name = JSON
+    module = msgspec.json
+
+    def frame(self, payload: bytes) -> bytes:
+        return payload + b"\n"
+
+    async def read(self, reader: StreamReader) -> Optional[bytes]:
+        return await reader.readline() or None
+
+    def split(self, data: bytes) -> Tuple[List[bytes], int]:
+        end = data.rfind(b"\n") + 1
+        return data[:end].splitlines(), end
+
+
+class LengthPrefixedMsgpack(WireFormat):
+    name = MSGPACK
+    module = msgspec.msgpack
+    header = struct.Struct(">I")
+
+    def frame(self, payload: bytes) -> bytes:
+        return self.header.pack(len(payload)) + payload
+
+    async def read(self, reader: StreamReader) -> Optional[bytes]:
+        try:
+            (size,) = self.header.unpack(await reader.readexactly(self.header.size))
+            return await reader.readexactly(size)
+        except IncompleteReadError:
+            return None
+
+    def split(self, data: bytes) -> Tuple[List[bytes], int]:
+        payloads = []
+        start = 0
+        while start + self.header.size <= len(data):
+            (size,) = self.header.unpack_from(data, start)
+            end = start + self.header.size + size
+            if end > len(data):
+                break
+            payloads.append(data[start + self.header.size : end])
+            start = end
+        return payloads, start
+
+
+WIRE_FORMATS: Dict[str, WireFormat] = {f.name: f for f in [JsonLines(), LengthPrefixedMsgpack()]}
+
+# registration and the answer to it are always sent as json lines, the negotiated format is used after that
+DEFAULT_WIRE_FORMAT = WIRE_FORMATS[JSON]
+
+
+def negotiate(offered: Sequence[str]) -> WireFormat:
+    """First offered format that is supported, json if there is none"""
+    return next((WIRE_FORMATS[name] for name in offered if name in WIRE_FORMATS), DEFAULT_WIRE_FORMAT)
@@ -0,0 +1,25 @@
+"""Seed streams.
+
+Every game is identified by its integer seed: the deck of a game is shuffled by ``random.Random(seed)``,
+so it depends only on the seed. Anything else that needs randomness in a game (bots, seating, sampling)
+should draw from its own stream derived from the game seed with ``derive_seed(seed, name)``. Since streams
+depend only on the game seed and the stream name, sharded simulations over a seed range produce
+the same games regardless of worker count and scheduling.
+"""
+
+import hashlib
+import random
+from typing import Optional, Union
+
+StreamKey = Union[int, str]
+
+
+def derive_seed(seed: int, *stream: StreamKey) -> int:
+    digest = hashlib.blake2b(repr((seed, *stream)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def seed_stream(seed: Optional[int], *stream: StreamKey) -> random.Random:
+    if seed is None:
+        return random.Random()  # noqa: S311
+    return random.Random(derive_seed(seed, *stream))  # noqa: S311
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Any, ClassVar, Dict, Type, TypeVar, Union
+from typing import Any, ClassVar, Dict, Tuple, Type, TypeVar, Union
 
 import msgspec
 from ordered_set import OrderedSet
@@ -15,6 +15,12 @@ def __get_root_type__(cls: Type["PolyStruct"]) -> Type["PolyStruct"]:
     return PolyStruct
 
 
+@lru_cache
+def __get_fields__(cls: Type["PolyStruct"]) -> Tuple[msgspec.structs.FieldInfo, ...]:
+    # resolved lazily, struct annotations can reference classes that are not defined yet
+    return msgspec.structs.fields(cls.__struct__)
+
+
 class PolyStructMeta(type):
     __typename__: str
     __struct__: Type[msgspec.Struct]
@@ -31,11 +37,17 @@ class PolyStructMeta(type):
             if hasattr(cls_, "__struct__"):
                 base_cls = cls_.__struct__
                 break
-        if "__annotations__" not in namespace:
-            namespace["__annotations__"] = {}
-        namespace["__annotations__"]["__typename__"] = str
+        # typename is encoded as msgspec tag, so structs are written in a single pass and decode as tagged unions
         namespace["__typename__"] = inst.__typename__
-        inst.__struct__ = type(inst.__name__ + "_Struct", (base_cls,), namespace, kw_only=True)
+        inst.__struct__ = type(
+            inst.__name__ + "_Struct",
+            (base_cls,),
+            namespace,
+            kw_only=True,
+            tag_field="__typename__",
+            tag=inst.__typename__ or None,
+        )
+        inst.__struct__.__polystruct__ = inst  # type: ignore[attr-defined]
         return inst
 
 
@@ -46,16 +58,16 @@ class PolyStruct(metaclass=PolyStructMeta):
     __struct__: ClassVar[Type[msgspec.Struct]]
 
     def __init__(self, **kwargs):
-        for field, default in zip(
-            self.__struct__.__struct_fields__,
-            self.__struct__.__struct_defaults__,  # type: ignore[attr-defined]
-        ):
-            if field == "__typename__":
-                continue
-
-            if default is msgspec.NODEFAULT and field not in kwargs:
-                raise ValueError(f"Missing {field} field for {self.__class__.__name__}")
-            setattr(self, field, kwargs.pop(field, default))
+        for field in __get_fields__(self.__class__):
+            if field.name in kwargs:
+                value = kwargs.pop(field.name)
+            elif field.default is not msgspec.NODEFAULT:
+                value = field.default
+            elif field.default_factory is not msgspec.NODEFAULT:
+                value = field.default_factory()
+            else:
+                raise ValueError(f"Missing {field.name} field for {self.__class__.__name__}")
+            setattr(self, field.name, value)
         if len(kwargs) != 0:
             raise ValueError(f"Extra fields for {self.__class__.__name__}: {list(kwargs)}")
 
@@ -100,28 +112,64 @@ def encode(value):
 
 def decode(cls: Type, value):
     if isinstance(cls, type) and issubclass(cls, PolyStruct):
-        if cls.__is_root__():
-            typename = value.pop("__typename__", None)
-            if typename is not None:
-                cls = cls.__class_map__[typename]
-        struct = msgspec.convert(value, type=cls.__struct__, str_keys=True, dec_hook=decode)
-        return cls(**{f: getattr(struct, f) for f in struct.__struct_fields__ if f != "__typename__"})
+        if cls.__is_root__() and "__typename__" not in value:
+            struct_type: Any = cls.__struct__
+        else:
+            struct_type = get_struct_type(cls)
+        return from_struct(msgspec.convert(value, type=struct_type, str_keys=True, dec_hook=decode))
     raise NotImplementedError
 
 
+def from_struct(struct: msgspec.Struct) -> Any:
+    """Build PolyStruct from its struct without copying or validating fields again"""
+    cls = struct.__polystruct__  # type: ignore[attr-defined]
+    obj = cls.__new__(cls)
+    obj.__dict__.update((f, getattr(struct, f)) for f in struct.__struct_fields__)
+    return obj
+
+
+def get_struct_type(cls: Type[PolyStruct]) -> Any:
+    """Struct type of the class, or tagged union of structs of all its subclasses for root classes"""
+    if not cls.__is_root__():
+        return cls.__struct__
+    # subclasses can be registered later, so union is rebuilt when class map grows
+    return __get_union_type__(cls, len(cls.__class_map__))
+
+
+@lru_cache
+def __get_union_type__(cls: Type[PolyStruct], _size: int) -> Any:
+    structs = [sub.__struct__ for sub in cls.__class_map__.values() if issubclass(sub, cls)]
+    if cls.__typename__ or not structs:
+        structs.append(cls.__struct__)
+    return Union[tuple(structs)]
+
+
 T = TypeVar("T", bound=Union[PolyStruct, msgspec.Struct])
 
 
+@lru_cache
+def get_encoder(module=msgspec.json):
+    return module.Encoder(enc_hook=encode)
+
+
+def get_decoder(cls: Any, module=msgspec.json):
+    if isinstance(cls, type) and issubclass(cls, PolyStruct):
+        return __get_decoder__(get_struct_type(cls), module)
+    return __get_decoder__(cls, module)
+
+
+@lru_cache
+def __get_decoder__(type_: Any, module) -> Any:
+    return module.Decoder(type=type_, dec_hook=decode)
+
+
 def dumps(obj: Union[T, Any], module=msgspec.json) -> Any:
-    try:
-        data = msgspec.to_builtins(obj, enc_hook=encode)
-    except TypeError:
-        print(dict(obj.__dict__))
-        raise
-    return module.encode(data)
+    return get_encoder(module).encode(obj)
 
 
 def loads(cls: Type[T], data: Any, module=msgspec.json) -> T:
-    obj: dict = module.decode(data, type=cls, dec_hook=decode)
-
-    return msgspec.convert(obj, cls)
+    obj = get_decoder(cls, module).decode(data)
+    if hasattr(obj, "__polystruct__"):
+        obj = from_struct(obj)
+    result: T = obj
+    return result
@@ -26,11 +26,8 @@ class ClassicDeckGenerator(DeckGenerator):
             for num, count in config.counts.items():
                 cards.extend([Card(col, num)] * count)
 
-        if self.random_state is not None:
-            random.seed(self.random_state)
-        random.shuffle(
-            cards,
-        )
+        # own generator per deck: concurrent games in one process don't share random state
+        random.Random(self.random_state).shuffle(cards)  # noqa: S311
         return Deck(cards=cards)
 
 
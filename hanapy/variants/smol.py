@@ -1,7 +1,7 @@
-from functools import partial
 from typing import Optional, Sequence
 
 from hanapy.core.config import CardConfig
+from hanapy.core.loop import GameVariant
 from hanapy.core.player import PlayerActor
 from hanapy.variants.classic import CLASSIC_COLORS, ClassicGame
 
@@ -13,8 +13,11 @@ class SmolGame(ClassicGame):
         self.max_number = max_number
 
     @classmethod
-    def variant(cls, max_colors: int, max_number: int):
-        return partial(cls, max_colors=max_colors, max_number=max_number)
+    def variant(cls, max_colors: int, max_number: int) -> GameVariant:
+        def create(players: Sequence[PlayerActor], random_seed: Optional[int]) -> "SmolGame":
+            return cls(players, max_colors, max_number, random_seed)
+
+        return create
 
     def get_card_config(self) -> CardConfig:
         counts = {i: 2 for i in range(1, self.max_number)}
@@ -22,3 +25,12 @@ class SmolGame(ClassicGame):
         counts[self.max_number] = 1
 
         return CardConfig(counts=counts, colors=CLASSIC_COLORS[: self.max_colors])
+
+    def get_hand_size(self, player_count: int):
+        # small decks can't fill classic hands, every player gets an equal share of the deck instead
+        config = self.get_card_config()
+        deck_size = len(config.colors) * sum(config.counts.values())
+        hand_size = min(super().get_hand_size(player_count), deck_size // player_count)
+        if hand_size == 0:
+            raise ValueError(f"Deck of {deck_size} cards is too small for {player_count} players")
+        return hand_size
@@ -18,7 +18,7 @@ def test_no_connecting_through_self():
     view.memo.add(cell)
     view.cards[1] = p1cards
     view.state.clued.cards[1] = p1infos
-    view.state.played.play(Cards.parse_card("1r", config.cards.colors))
+    view.state.played = view.state.played.with_card(Cards.parse_card("1r", config.cards.colors))
     conview = RankingConventionsView(view, [], False)
 
     clue = Clue(to_player=1, number=3, color=None)
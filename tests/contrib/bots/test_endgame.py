@@ -0,0 +1,55 @@
+import random
+
+import pytest
+from msgspec import structs
+
+from hanapy.contrib.bots.endgame import EndgameSolver
+from hanapy.contrib.bots.utils import get_legal_actions
+from hanapy.core.action import DiscardAction
+from hanapy.core.config import PlayedCards
+from hanapy.core.state import GameData
+from tests.contrib.conftest import Games
+
+
+def get_endgame(players: int, seed: int, shuffle_played: bool = True) -> GameData:
+    data = Games.classic(players, seed).get_loop().data
+    data.config = structs.replace(data.config, unlimited_clues=True)
+    while not data.deck.is_empty():
+        data, _ = data.simulate(DiscardAction(player=data.state.current_player, card=0))
+    data.config = structs.replace(data.config, unlimited_clues=False)
+    if shuffle_played:
+        # not consistent with seen cards, but makes some cards in hands playable
+        rng = random.Random(seed)  # noqa: S311
+        data.state.played = PlayedCards(cards={c: rng.randint(0, 3) for c in data.state.played.cards})
+    data.state.clues_left = 2
+    return data
+
+
+def brute_force(data: GameData) -> int:
+    if data.game_ended:
+        return data.state.played.score
+    return max(brute_force(data.simulate(action)[0]) for action in get_legal_actions(data))
+
+
+@pytest.mark.parametrize("players", [2, 3])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_solver_is_exact(players, seed):
+    data = get_endgame(players, seed)
+    score, action = EndgameSolver().solve(data)
+    assert score == brute_force(data)
+    assert action is not None
+    new_data, _ = data.simulate(action)
+    assert brute_force(new_data) == score
+
+
+def test_solver_needs_empty_deck():
+    with pytest.raises(ValueError):
+        EndgameSolver().solve(Games.classic(2).get_loop().data)
+
+
+def test_best_action():
+    data = get_endgame(4, 0, shuffle_played=False)
+    view = data.get_current_player_view()
+    action = EndgameSolver().best_action(view, samples=4, rng=random.Random(0))  # noqa: S311
+    assert action.player == view.me
+    action.to_update(data).validate(data)
@@ -0,0 +1,74 @@
+import random
+import time
+
+from hanapy.contrib.bots.ismcts import SHARED_POOL, ISMCTSBotPlayer
+from hanapy.contrib.bots.utils import get_possible_actions
+from hanapy.core.player import run_coroutine_sync
+from hanapy.players.dummy import DiscardingPlayer
+from hanapy.runtime.simulation import play_game
+from hanapy.variants.classic import ClassicGame
+from tests.contrib.conftest import Games
+
+
+def test_ismcts_game():
+    players = [ISMCTSBotPlayer(str(i), iterations=5) for i in range(2)]
+    loop = ClassicGame(players, random_seed=0).get_loop()
+    loop.run_sync()
+    assert loop.data.game_ended
+
+
+def test_ismcts_time_budget():
+    view = Games.classic(3).get_loop().data.get_player_view(0)
+    bot = ISMCTSBotPlayer("", iterations=None, time_budget=0.2)
+    start = time.perf_counter()
+    action = run_coroutine_sync(bot.get_next_action(view))
+    # generous bound, loaded machines can be slow to return from the search
+    assert time.perf_counter() - start < 1
+    assert str(action) in {str(a) for a in get_possible_actions(view)}
+
+
+def test_ismcts_workers():
+    view = Games.classic(2).get_loop().data.get_player_view(0)
+    bots = [ISMCTSBotPlayer(str(i), iterations=3, workers=2) for i in range(2)]
+    try:
+        for bot in bots:
+            run_coroutine_sync(bot.on_game_start(view))
+        assert bots[0].get_executor() is bots[1].get_executor()
+        action = run_coroutine_sync(bots[0].get_next_action(view))
+    finally:
+        SHARED_POOL.shutdown()
+    assert str(action) in {str(a) for a in get_possible_actions(view)}
+
+
+def test_ismcts_visits_grow_with_workers():
+    view = Games.classic(2).get_loop().data.get_player_view(0)
+    try:
+        visits = [
+            sum(visits for visits, _ in ISMCTSBotPlayer("", iterations=10, workers=workers).search(view).values())
+            for workers in (1, 2, 3)
+        ]
+    finally:
+        SHARED_POOL.shutdown()
+    assert visits == [10, 20, 30]
+
+
+class RandomPlayer(DiscardingPlayer):
+    def __init__(self, name: str, seed: int):
+        super().__init__(name)
+        self.random = random.Random(seed)  # noqa: S311
+
+    async def get_next_action(self, view):
+        return self.random.choice(list(get_possible_actions(view)))
+
+
+def test_ismcts_beats_random_play():
+    seeds = [0, 1]
+    scores = [
+        play_game("classic", [ISMCTSBotPlayer(str(i), iterations=60) for i in range(2)], seed).result.score
+        for seed in seeds
+    ]
+    random_scores = [
+        play_game("classic", [RandomPlayer(str(i), seed * 2 + i) for i in range(2)], seed).result.score
+        for seed in seeds
+    ]
+    assert min(scores) > max(random_scores)
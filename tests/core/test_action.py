@@ -0,0 +1,28 @@
+from copy import deepcopy
+
+from hanapy.contrib.bots.utils import get_possible_actions
+from tests.contrib.conftest import Games
+
+
+def test_apply_undo_restores_data():
+    data = Games.classic(3).get_loop().data
+    for turn in range(40):
+        view = data.get_current_player_view()
+        actions = list(get_possible_actions(view))
+        for action in actions:
+            update = action.to_update(data)
+            snapshot = deepcopy(data)
+            visible = [list(data.get_visible_counts(p)) for p in range(3)]
+            undo = update.apply(data)
+            data.next_turn()
+            data.prev_turn()
+            update.undo(data, undo)
+
+            assert data == snapshot
+            assert [data.get_visible_counts(p) for p in range(3)] == visible
+
+        action = actions[(turn * 7) % len(actions)]
+        action.to_update(data).apply(data)
+        data.next_turn()
+        if data.game_ended:
+            break
@@ -0,0 +1,42 @@
+from hanapy.core.action import ClueAction, DiscardAction, PlayAction
+from hanapy.core.action_space import ActionSpace
+from hanapy.core.card import Clue
+from tests.contrib.conftest import Games
+
+
+def test_action_space():
+    data = Games.classic(3).get_loop().data
+    view = data.get_player_view(1)
+    space = ActionSpace.from_view(view)
+    assert space.size == 2 * 5 + 2 * (5 + 5)
+
+    actions = list(space.actions())
+    assert len(actions) == len({str(a) for a in actions})
+    assert not any(isinstance(a, DiscardAction) for a in actions)
+    for index, action in zip(space.iter_legal(), actions):
+        assert space.index(action) == index
+        assert space.is_legal(action)
+        if isinstance(action, ClueAction):
+            cards = data.players[action.clue.to_player].cards
+            expected = action.clue.get_touched(cards)
+            assert space.get_clue_result(index).touched == expected
+            assert len(expected) > 0
+
+    clues = {str(a) for a in actions if isinstance(a, ClueAction)}
+    for player in [0, 2]:
+        for card in data.players[player].cards:
+            assert str(ClueAction(player=1, clue=Clue.new(player, color=card.color))) in clues
+            assert str(ClueAction(player=1, clue=Clue.new(player, number=card.number))) in clues
+
+    assert not space.is_legal(ClueAction(player=1, clue=Clue.new(1, number=1)))
+    assert not space.is_legal(PlayAction(player=1, card=5))
+    assert space.is_legal(PlayAction(player=1, card=4))
+
+
+def test_action_space_from_data():
+    data = Games.classic(2).get_loop().data
+    data.state.clues_left = 0
+    space = ActionSpace.from_data(data)
+    assert [str(a) for a in space.actions()] == [str(PlayAction(player=0, card=i)) for i in range(5)] + [
+        str(DiscardAction(player=0, card=i)) for i in range(5)
+    ]
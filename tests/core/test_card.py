@@ -0,0 +1,106 @@
+import pickle
+from copy import deepcopy
+
+import msgspec
+import pytest
+
+from hanapy.core.card import Card, CardInfo, Clue
+from hanapy.core.config import GameState
+from hanapy.core.player import PlayerView
+from hanapy.utils.ser import dumps, loads
+from hanapy.variants.smol import SmolGame
+from tests.contrib.conftest import Games, Players
+
+
+def test_card_table_ids():
+    config = Games.classic(2).get_game_config().cards
+    table = config.table
+    assert table is Games.classic(3).get_game_config().cards.table
+    assert table.size == 25
+    assert [table.card_id(card) for card in table.cards] == list(range(25))
+    assert table.cards[7] == Card(config.colors[1], 3)
+    assert sum(table.card_counts) == 50
+
+    counts = table.count_cards([Card(config.colors[0], 1), Card(config.colors[0], 1)], [0] * table.size)
+    assert counts[0] == 2
+    assert sum(counts) == 2
+
+
+def test_card_info_bitmask():
+    config = Games.classic(2).get_game_config().cards
+    red, green = config.colors[0], config.colors[1]
+    info = CardInfo.create(config)
+    assert info.count == 25
+    assert not info.is_known
+
+    info.not_touch(Clue.new(1, color=red))
+    info.touch(Clue.new(1, number=2))
+    assert info.numbers == [2]
+    assert info.number == 2
+    assert red not in info.colors
+    assert info.count == 4
+    assert info.is_touched
+
+    info.touch(Clue.new(1, color=green))
+    assert info.is_known
+    assert info.as_card() == Card(green, 2)
+    assert list(info.iter_possible()) == [Card(green, 2)]
+
+
+def test_card_info_remove_impossible():
+    config = Games.classic(2).get_game_config().cards
+    table = config.table
+    info = CardInfo.create(config)
+    info.touch(Clue.new(1, number=5))
+    impossible = sum(1 << table.card_id(Card(color, 5)) for color in config.colors[1:])
+
+    copy = info.copy()
+    assert copy.remove_impossible(impossible)
+    assert copy.as_card() == Card(config.colors[0], 5)
+    assert info.count == 5
+    assert not copy.remove_impossible(impossible)
+
+
+def test_card_info_serialization():
+    view = Games.classic(2).get_loop().data.get_player_view(0)
+    assert loads(PlayerView, dumps(view)) == view
+
+
+@pytest.mark.parametrize("module", [msgspec.json, msgspec.msgpack])
+def test_card_table_is_shared(module):
+    view = Games.classic(4).get_loop().data.get_player_view(0)
+    data = dumps(view, module)
+    decoded = loads(PlayerView, data, module)
+    assert decoded == view
+    table = decoded.config.cards.table
+    assert table is view.config.cards.table
+    assert all(info.table is table for cards in decoded.state.clued.cards for info in cards)
+    assert deepcopy(decoded).state.clued[1][0].table is table
+    assert pickle.loads(pickle.dumps(decoded)).state.clued[1][0].table is table  # noqa: S301
+    # same view encoded before card infos were bitmasks
+    if module is msgspec.json:
+        assert len(data) <= 4445
+
+
+@pytest.mark.parametrize("module", [msgspec.json, msgspec.msgpack])
+def test_card_info_round_trip(module):
+    config = SmolGame(Players.discarding(2), 3, 4, random_seed=0).get_game_config().cards
+    info = CardInfo.create(config)
+    info.touch(Clue.new(0, number=2))
+    decoded = loads(CardInfo, dumps(info, module), module)
+    assert decoded == info
+    assert decoded.table is config.table
+    assert decoded.numbers == [2]
+    assert decoded.colors == config.colors
+    decoded.touch(Clue.new(0, color=config.colors[1]))
+    assert decoded.as_card() == Card(config.colors[1], 2)
+
+
+@pytest.mark.parametrize("module", [msgspec.json, msgspec.msgpack])
+def test_game_state_round_trip(module):
+    data = Games.classic(3).get_loop().data
+    data.state.clued.apply_clue(1, Clue.new(1, number=1), [0, 2])
+    decoded = loads(GameState, dumps(data.state, module), module)
+    assert decoded == data.state
+    assert decoded.clued[1][0].numbers == [1]
+    assert decoded.clued[1][1].colors == data.config.cards.colors
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from hanapy.contrib.bots.ranking_conventions.bot import RankingConventionsBotPlayer
+from hanapy.contrib.bots.simple import SimpleBotPlayer
+from hanapy.core.loop import CompactGameLog
+from hanapy.core.player import run_coroutine_sync
+from hanapy.core.timing import APPLY, GET_NEXT_ACTION, OBSERVE_UPDATE, PHASES, VIEW, HistogramSink
+from hanapy.variants.classic import ClassicGame
+
+
+def _run(compact: bool):
+    loop = ClassicGame([SimpleBotPlayer("0"), SimpleBotPlayer("1")], random_seed=1).get_loop()
+    if compact:
+        loop.use_compact_logs(checkpoint_every=10)
+    asyncio.run(loop.run())
+    return loop.logs
+
+
+def test_compact_logs_replay():
+    full = _run(compact=False)
+    compact = _run(compact=True)
+    assert isinstance(compact, CompactGameLog)
+    assert len(compact) == len(full)
+    assert sorted(compact.checkpoints) == list(range(0, len(full), 10))
+
+    for log, replayed in zip(full, compact):
+        assert replayed.action == log.action
+        assert replayed.data.state == log.data.state
+        assert replayed.data.deck == log.data.deck
+    assert compact[-1].data.players[0].cards == full[-1].data.players[0].cards
+    assert [log.turn for log in compact[1::2]] == [log.turn for log in full[1::2]]
+
+
+def test_run_sync_matches_run():
+    def make_loop():
+        players = [RankingConventionsBotPlayer.bot(log=False)(str(i)) for i in range(3)]
+        return ClassicGame(players, random_seed=3).get_loop()
+
+    async_loop = make_loop()
+    asyncio.run(async_loop.run())
+    sync_loop = make_loop()
+    sync_loop.run_sync()
+
+    assert [log.action for log in sync_loop.logs] == [log.action for log in async_loop.logs]
+    assert sync_loop.data.get_game_result() == async_loop.data.get_game_result()
+
+
+def test_run_coroutine_sync():
+    async def ready():
+        return 1
+
+    async def suspending():
+        await asyncio.sleep(0)
+
+    assert run_coroutine_sync(ready()) == 1
+    with pytest.raises(RuntimeError):
+        run_coroutine_sync(suspending())
+
+
+@pytest.mark.parametrize("sync", [True, False])
+def test_timing(sync):
+    loop = ClassicGame([SimpleBotPlayer("0"), SimpleBotPlayer("1")], random_seed=1).get_loop()
+    sink = HistogramSink()
+    loop.use_timing(sink)
+    if sync:
+        loop.run_sync()
+    else:
+        asyncio.run(loop.run())
+
+    turns = loop.data.state.turn - 1
+    assert {phase for phase, _ in sink.histograms} == set(PHASES)
+    for player in range(2):
+        assert sink.histograms[(OBSERVE_UPDATE, player)].count == turns
+    assert sink.get_phase(GET_NEXT_ACTION).count == turns
+    assert sink.get_phase(VIEW).count == turns * 5
+    histogram = sink.get_phase(APPLY)
+    assert 0 < histogram.min <= histogram.percentile(0.5) <= histogram.max
+    assert sum(histogram.buckets.values()) == turns
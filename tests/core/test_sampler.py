@@ -0,0 +1,52 @@
+import random
+from collections import Counter
+
+import pytest
+
+from hanapy.core.action import ClueAction, DiscardAction
+from hanapy.core.card import Clue
+from hanapy.core.sampler import HandSampler, is_feasible
+from tests.contrib.conftest import Games
+
+
+def test_is_feasible():
+    assert is_feasible([0b011, 0b011], [1, 1, 0])
+    assert not is_feasible([0b001, 0b001], [1, 1, 0])
+    assert is_feasible([0b001, 0b011, 0b110], [1, 1, 1])
+    assert not is_feasible([0b001, 0b011, 0b011], [1, 1, 1])
+
+
+def test_samples_are_consistent():
+    data = Games.classic(2).get_loop().data
+    hand = data.players[0].cards
+    clue = Clue.new(to_player=0, number=hand[0].number)
+    for action in [ClueAction(player=1, clue=clue), DiscardAction(player=0, card=4), DiscardAction(player=1, card=0)]:
+        action.to_update(data).apply(data)
+        data.next_turn()
+
+    view = data.get_player_view(0)
+    sampler = HandSampler(view, random.Random(0))  # noqa: S311
+    table = view.config.cards.table
+    hands = Counter()
+    for _ in range(200):
+        sample = sampler.sample()
+        assert len(sample.hand) == len(view.my_cards)
+        assert len(sample.deck) == view.state.cards_left
+        for card, card_info in zip(sample.hand, view.my_cards):
+            assert card_info.mask >> table.card_id(card) & 1
+        counts = table.count_cards(sample.hand + sample.deck, list(view.get_visible_counts()))
+        assert counts == list(table.card_counts)
+        hands[tuple(sample.hand)] += 1
+    assert len(hands) > 1
+
+    game_data = sampler.sample_game_data()
+    assert game_data.get_visible_counts(0) == view.get_visible_counts()
+    game_data.simulate(DiscardAction(player=0, card=0))
+
+
+def test_inconsistent_view():
+    view = Games.classic(2).get_loop().data.get_player_view(0)
+    for card_info in view.my_cards:
+        card_info.mask = 1
+    with pytest.raises(ValueError):
+        HandSampler(view)
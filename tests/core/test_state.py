@@ -0,0 +1,83 @@
+from copy import deepcopy
+
+import pytest
+
+from hanapy.core.action import DiscardAction, PlayAction
+from hanapy.core.card import Clue
+from tests.contrib.conftest import Games
+
+
+def test_player_view_is_snapshot():
+    loop = Games.classic(2).get_loop()
+    data = loop.data
+    view = data.get_player_view(1)
+    assert view.config is data.config
+    assert view.state.discarded is data.state.discarded
+
+    DiscardAction(player=0, card=0).to_update(data).apply(data)
+    PlayAction(player=0, card=0).to_update(data).apply(data)
+
+    assert len(view.state.discarded.cards) == 0
+    assert view.state.played.score == 0
+    assert view.cards[0] != data.players[0].cards
+    assert len(data.state.discarded.cards) + data.state.played.score >= 1
+
+
+def test_changing_view_leaves_game_data():
+    data = Games.classic(3).get_loop().data
+    before = deepcopy(data)
+    view = data.get_player_view(1)
+    card = data.players[0].cards[0]
+
+    view.state.played = view.state.played.with_card(card)
+    view.state.discarded = view.state.discarded.with_card(card)
+    view.state.clued.apply_clue(0, Clue.new(0, number=card.number), [0])
+    view.state.clues_left -= 1
+    view.cards[0].pop()
+    view.visible[0] += 1
+    with pytest.raises(AttributeError):
+        view.config.unlimited_clues = True
+    with pytest.raises(AttributeError):
+        view.state.played.cards = {}
+
+    assert data == before
+    assert data.get_visible_counts(1) == before.get_visible_counts(1)
+
+
+def test_visible_counts_are_incremental():
+    loop = Games.classic(3).get_loop()
+    data = loop.data
+    data.get_visible_counts(0)
+    for turn in range(12):
+        player = data.state.current_player
+        action = DiscardAction(player=player, card=turn % 3) if turn % 2 else PlayAction(player=player, card=0)
+        action.to_update(data).apply(data)
+        data.next_turn()
+
+        fresh = deepcopy(data)
+        for observer in range(3):
+            assert data.get_visible_counts(observer) == fresh.get_visible_counts(observer)
+            view = data.get_player_view(observer)
+            view.visible = []
+            assert view.get_visible_counts() == data.get_visible_counts(observer)
+
+
+def test_simulate_does_not_touch_original():
+    data = Games.classic(3).get_loop().data
+    data.get_visible_counts(0)
+    before = deepcopy(data)
+
+    new_data, reward = data.simulate(PlayAction(player=0, card=0))
+    assert data == before
+    assert data.get_visible_counts(0) == before.get_visible_counts(0)
+    assert new_data.config is data.config
+    assert new_data.state.turn == data.state.turn + 1
+    assert reward == new_data.state.played.score
+    assert new_data.deck.size() == data.deck.size() - 1
+
+    expected = deepcopy(data)
+    PlayAction(player=0, card=0).to_update(expected).apply(expected)
+    expected.next_turn()
+    assert new_data == expected
+    for observer in range(3):
+        assert new_data.get_visible_counts(observer) == expected.get_visible_counts(observer)
@@ -0,0 +1,96 @@
+import pytest
+
+from hanapy.contrib.bots import BOTS
+from hanapy.runtime.archive import (
+    ArchiveReader,
+    ArchiveWriter,
+    GameRecorder,
+    get_game_id,
+    record_game,
+    simulate_to_archive,
+)
+from hanapy.runtime.simulation import run_game
+from hanapy.variants.classic import ClassicGame
+
+
+def test_random_turn_access(tmp_path):
+    path = str(tmp_path / "games.hnpa")
+    bots = ["rank_conv", "rank_conv"]
+    loops = {}
+    with ArchiveWriter(path) as writer:
+        for seed in [1, 2]:
+            loop = ClassicGame([BOTS[bot](str(i)) for i, bot in enumerate(bots)], random_seed=seed).get_loop()
+            recorder = GameRecorder(get_game_id("classic", bots, seed), "classic", seed, block_turns=5)
+            loop.add_log_sink(recorder)
+            loop.run_sync()
+            writer.add(recorder.finish())
+            loops[seed] = loop
+
+    with ArchiveReader(path) as reader:
+        assert len(reader) == 2
+        for seed, loop in loops.items():
+            (game,) = reader.find(seed=seed)
+            assert game.turns == len(loop.logs)
+            for expected in reversed(loop.logs):
+                log = reader.get_turn(game.game_id, expected.turn)
+                assert log.turn == expected.turn
+                assert log.action == expected.action
+                assert log.update == expected.update
+                assert log.data.state == expected.data.state
+                assert log.data.players[1].cards == expected.data.players[1].cards
+            assert [log.turn for log in reader.iter_game(game.game_id)] == [log.turn for log in loop.logs]
+            with pytest.raises(KeyError):
+                reader.get_turn(game.game_id, loop.logs[-1].turn + 1)
+
+
+def test_append_to_archive(tmp_path):
+    path = str(tmp_path / "games.hnpa")
+    bots = ["simple", "simple"]
+    results = list(simulate_to_archive(path, "classic", bots, range(2)))
+    results += list(simulate_to_archive(path, "classic", bots, range(2, 4), workers=2))
+    assert results == [run_game("classic", bots, seed) for seed in range(4)]
+
+    with ArchiveWriter(path) as writer, pytest.raises(ValueError):
+        writer.add(record_game("classic", bots, 0)[1])
+
+    with ArchiveReader(path) as reader:
+        assert [game.seed for game in reader.find(variant="classic")] == [0, 1, 2, 3]
+        for result in results:
+            game_id = get_game_id("classic", bots, result.seed)
+            logs = list(reader.iter_game(game_id))
+            assert len(logs) == reader.games[game_id].turns
+            assert logs[-1].turn == result.turns
+
+
+def test_not_an_archive(tmp_path):
+    path = tmp_path / "games.hnpa"
+    path.write_bytes(b"not an archive")
+    with pytest.raises(ValueError):
+        ArchiveReader(str(path))
+
+
+def test_interrupted_append(tmp_path):
+    path = str(tmp_path / "games.hnpa")
+    bots = ["simple", "simple"]
+    list(simulate_to_archive(path, "classic", bots, range(2)))
+
+    # writer killed before close: blocks of new games are written, index is not
+    writer = ArchiveWriter(path)
+    writer.add(record_game("classic", bots, 2)[1])
+    writer._file.flush()
+    with ArchiveReader(path) as reader:
+        assert [game.seed for game in reader.find()] == [0, 1]
+    writer._file.close()
+
+    list(simulate_to_archive(path, "classic", bots, range(3, 5)))
+    with ArchiveReader(path) as reader:
+        assert [game.seed for game in reader.find()] == [0, 1, 3, 4]
+        assert len(list(reader.iter_game(get_game_id("classic", bots, 4)))) == reader.find(seed=4)[0].turns
+
+
+def test_new_archive_is_readable_before_close(tmp_path):
+    path = str(tmp_path / "games.hnpa")
+    writer = ArchiveWriter(path)
+    with ArchiveReader(path) as reader:
+        assert len(reader) == 0
+    writer.close()
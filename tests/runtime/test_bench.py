@@ -0,0 +1,26 @@
+from hanapy.runtime.bench import BenchReport, BenchResult, compare, get_regressions, run_benchmarks
+
+
+def test_run_benchmarks():
+    report = run_benchmarks("classic", ["simple"], min_time=1e-9)
+    names = [r.name for r in report.results]
+    assert "loop/classic/simple" in names
+    assert "loads/observe_update" in names
+    assert "decision/classic/simple" in names
+    assert all(r.ops > 0 and r.rate > 0 for r in report.results)
+    assert BenchReport.from_json(report.to_json()) == report
+
+    only = run_benchmarks("classic", ["simple"], min_time=1e-9, only="dumps/")
+    assert [r.name for r in only.results] == ["dumps/wait_for_action", "dumps/action", "dumps/observe_update"]
+
+
+def test_compare():
+    def report(**rates):
+        return BenchReport(
+            meta={}, results=[BenchResult(name=n, unit="ops/s", ops=1, seconds=1, rate=r) for n, r in rates.items()]
+        )
+
+    comparisons = compare(report(a=80, b=100, c=1), report(a=100, b=100))
+    assert [c.name for c in comparisons] == ["a", "b"]
+    assert [c.name for c in get_regressions(comparisons, 0.1)] == ["a"]
+    assert get_regressions(comparisons, 0.25) == []
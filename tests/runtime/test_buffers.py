@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from hanapy.core.action import DiscardAction
+from hanapy.runtime.buffers import DROP_NEWEST, DROP_OLDEST, RAISE, EventBuffer, EventBufferOverflow, EventWaitAborted
+from hanapy.runtime.events import ActionEvent, Event, MessageEvent, StartGameEvent
+
+
+def test_waiter_is_woken_by_event():
+    asyncio.run(_waiter_is_woken_by_event())
+
+
+async def _waiter_is_woken_by_event():
+    buf = EventBuffer(breaker_interval=10)
+
+    async def never_stopped():
+        return False
+
+    task = asyncio.create_task(buf.wait_for_event(MessageEvent, breaker=never_stopped))
+    await asyncio.sleep(0)
+    buf.add(StartGameEvent(pid="0"))
+    buf.add(MessageEvent(pid="0", text="hi"))
+    event = await asyncio.wait_for(task, timeout=1)
+    assert event.text == "hi"
+    assert await buf.wait_for_event(Event) == StartGameEvent(pid="0")
+
+
+def test_breaker():
+    asyncio.run(_breaker())
+
+
+async def _breaker():
+    buf = EventBuffer(breaker_interval=0.01)
+    stopped = False
+
+    async def breaker():
+        return stopped
+
+    task = asyncio.create_task(buf.wait_for_event(MessageEvent, breaker=breaker))
+    await asyncio.sleep(0.02)
+    assert not task.done()
+    stopped = True
+    with pytest.raises(EventWaitAborted):
+        await asyncio.wait_for(task, timeout=1)
+    buf.add(MessageEvent(pid="0", text="hi"))
+    assert buf.search_event(MessageEvent) is not None
+
+
+def test_cancelled_waiter_does_not_lose_events():
+    asyncio.run(_cancelled_waiter_does_not_lose_events())
+
+
+async def _cancelled_waiter_does_not_lose_events():
+    buf = EventBuffer()
+    first = asyncio.create_task(buf.wait_for_event(MessageEvent))
+    second = asyncio.create_task(buf.wait_for_event(MessageEvent))
+    await asyncio.sleep(0)
+    buf.add(MessageEvent(pid="0", text="hi"))
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert (await asyncio.wait_for(second, timeout=1)).text == "hi"
+
+
+def test_search_by_type_keeps_order():
+    buf = EventBuffer()
+    events = [
+        MessageEvent(pid="0", text="a"),
+        StartGameEvent(pid="0"),
+        MessageEvent(pid="0", text="b"),
+        ActionEvent(pid="0", action=DiscardAction(player=0, card=0)),
+    ]
+    for event in events:
+        buf.add(event)
+    assert buf.search_event(ActionEvent) == events[3]
+    assert buf.search_event(MessageEvent) == events[0]
+    assert buf.search_event(Event) == events[1]
+    buf.add(MessageEvent(pid="0", text="c"))
+    assert [buf.search_event(Event), buf.search_event(Event)] == [events[2], MessageEvent(pid="0", text="c")]
+    assert buf.search_event(Event) is None
+    assert len(buf) == 0
+
+
+@pytest.mark.parametrize(("overflow", "expected"), [(DROP_OLDEST, ["b", "c"]), (DROP_NEWEST, ["a", "b"])])
+def test_overflow(overflow, expected):
+    buf = EventBuffer(capacity=2, overflow=overflow)
+    for text in "abc":
+        buf.add(MessageEvent(pid="0", text=text))
+    assert len(buf) == 2
+    assert [buf.search_event(MessageEvent).text, buf.search_event(MessageEvent).text] == expected
+
+
+def test_overflow_raise():
+    buf = EventBuffer(capacity=1, overflow=RAISE)
+    buf.add(MessageEvent(pid="0", text="a"))
+    with pytest.raises(EventBufferOverflow):
+        buf.add(MessageEvent(pid="0", text="b"))
+    with pytest.raises(ValueError):
+        EventBuffer(overflow="ignore")
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from hanapy.contrib.bots.simple import SimpleBotPlayer
+from hanapy.core.loop import CompactGameLog
+from hanapy.runtime.logs import LogTail, StreamingLogSink, get_log_format, read_logs
+from hanapy.variants.classic import ClassicGame
+
+
+@pytest.mark.parametrize("extension", [".jsonl", ".msgpack"])
+def test_streaming_log(tmp_path, extension):
+    path = str(tmp_path / f"game{extension}")
+    loop = ClassicGame([SimpleBotPlayer("0"), SimpleBotPlayer("1")], random_seed=1).get_loop()
+    with StreamingLogSink(path, flush_every=4) as sink:
+        loop.add_log_sink(sink)
+        loop.run_sync()
+    assert isinstance(loop.logs, CompactGameLog)
+
+    logs = read_logs(path)
+    assert len(logs) == len(loop.logs)
+    for log, expected in zip(logs, loop.logs):
+        assert log.turn == expected.turn
+        assert log.action == expected.action
+        assert log.update == expected.update
+        assert log.data.state == expected.data.state
+        assert log.data.players[0].cards == expected.data.players[0].cards
+
+
+@pytest.mark.parametrize("extension", [".jsonl", ".msgpack"])
+def test_tail_incomplete_record(tmp_path, extension):
+    path = str(tmp_path / f"game{extension}")
+    loop = ClassicGame([SimpleBotPlayer("0"), SimpleBotPlayer("1")], random_seed=1).get_loop()
+    loop.run_sync()
+    with StreamingLogSink(path) as sink:
+        for log in loop.logs[:3]:
+            sink.write(log)
+    with open(path, "rb") as f:
+        data = f.read()
+    os.truncate(path, len(data) - 10)
+
+    tail = LogTail(path)
+    assert [log.turn for log in tail.read()] == [log.turn for log in loop.logs[:2]]
+    assert tail.read() == []
+    with open(path, "ab") as f:
+        f.write(data[-10:])
+    assert [log.action for log in tail.read()] == [loop.logs[2].action]
+
+
+def test_log_format():
+    assert get_log_format("a/b.jsonl").name == "json"
+    assert get_log_format("b.msgpack").name == "msgpack"
+    assert get_log_format("b.json") is None
+    with pytest.raises(ValueError):
+        StreamingLogSink("b.json")
+
+
+def test_log_is_overwritten(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    for seed in [1, 2]:
+        loop = ClassicGame([SimpleBotPlayer("0"), SimpleBotPlayer("1")], random_seed=seed).get_loop()
+        with StreamingLogSink(path) as sink:
+            loop.add_log_sink(sink)
+            loop.run_sync()
+    assert [log.action for log in read_logs(path)] == [log.action for log in loop.logs]
@@ -0,0 +1,141 @@
+import asyncio
+from copy import deepcopy
+from functools import partial
+from typing import Dict, List
+
+import pytest
+
+from hanapy.contrib.bots import BOTS
+from hanapy.runtime.asyncio import AsyncClient, AsyncServer
+from hanapy.runtime.bench import record_game
+from hanapy.runtime.events import (
+    GameEndedEvent,
+    ObserveUpdateEvent,
+    ResyncEvent,
+    ResyncRequestEvent,
+    StartGameEvent,
+    WaitForActionEvent,
+)
+from hanapy.runtime.players import ClientPlayerProxy, ServerPlayerActor
+from hanapy.runtime.replica import ViewReplica, get_view_checksum
+from hanapy.runtime.simulation import run_game
+from hanapy.variants import VARIANTS
+from tests.runtime.test_wire import get_free_port
+
+
+@pytest.mark.parametrize("players", [2, 4])
+def test_replica_matches_server_views(players):
+    logs = record_game("classic", "rank_conv", players, seed=1)
+    replicas = [ViewReplica(logs[0].data.get_player_view(p)) for p in range(players)]
+    for log in logs:
+        data = deepcopy(log.data)
+        log.update.apply(data)
+        for player, replica in enumerate(replicas):
+            replica.apply(log.update)
+            view = data.get_player_view(player)
+            replica.set_memo(view.memo)
+            assert replica.get_view() == view
+            assert replica.checksum() == get_view_checksum(view)
+            replica.next_turn()
+
+
+def test_replica_views_are_copies():
+    data = record_game("classic", "simple", 2)[0].data
+    replica = ViewReplica(data.get_player_view(0))
+    checksum = replica.checksum()
+    view = replica.get_view()
+    view.cards[1].clear()
+    view.state.clued[0][0].mask = 0
+    assert replica.checksum() == checksum
+
+
+class ResyncClient:
+    def __init__(self, view):
+        self.view = view
+        self.sent = []
+
+    async def send_event(self, event):
+        self.sent.append(event)
+
+    async def wait_for_event(self, event_type):
+        assert event_type is ResyncEvent
+        return ResyncEvent(pid="0", view=self.view)
+
+
+def test_resync_on_checksum_mismatch():
+    asyncio.run(_resync_on_checksum_mismatch())
+
+
+async def _resync_on_checksum_mismatch():
+    log = record_game("classic", "rank_conv", 2)[3]
+    data = deepcopy(log.data)
+    view = data.get_player_view(0)
+    log.update.apply(data)
+    new_view = data.get_player_view(0)
+
+    replica = ViewReplica(view)
+    replica.view.state.clues_left -= 1
+    client = ResyncClient(view)
+    proxy = ClientPlayerProxy("0", client, BOTS["simple"]("0"))
+    old, new = await proxy.sync_replica(replica, None, get_view_checksum(new_view), log.update)
+    assert client.sent == [ResyncRequestEvent(pid="0")]
+    assert (old, new) == (view, new_view)
+
+    client.sent.clear()
+    assert await proxy.sync_replica(replica, view, get_view_checksum(view)) == (view, view)
+    assert client.sent == []
+
+
+@pytest.mark.parametrize(("delta_updates", "resync_every"), [(False, 0), (True, 0), (True, 3)])
+def test_network_game(delta_updates, resync_every):
+    asyncio.run(_network_game(delta_updates, resync_every))
+
+
+async def _network_game(delta_updates, resync_every):
+    port = get_free_port()
+    seed = 3
+    server = AsyncServer("127.0.0.1", port)
+    server.resync_every = resync_every
+    await server.start("0", VARIANTS["classic"], seed, None)
+
+    results = []
+    # turns seen by handlers of full view events, like the ones of log bots, 0 for waits for action
+    observed: Dict[str, List[int]] = {"0": [], "1": []}
+    proxies = []
+    tasks = []
+    for pid in ["0", "1"]:
+        client = AsyncClient("127.0.0.1", port, delta_updates=delta_updates)
+        client.add_event_handler(GameEndedEvent, lambda event: results.append(event.game_result) or True)
+        client.add_event_handler(
+            ObserveUpdateEvent, partial(lambda p, event: observed[p].append(event.new_view.state.turn) or True, pid)
+        )
+        client.add_event_handler(WaitForActionEvent, partial(lambda p, event: observed[p].append(0) or True, pid))
+        proxies.append(ClientPlayerProxy(pid, client, BOTS["rank_conv"](pid)))
+        tasks.append(asyncio.create_task(proxies[-1].run(is_host=False, auto_start_players=None)))
+        # wait for registration, so players get seats in order
+        while pid not in server.list_players():
+            await asyncio.sleep(0.01)
+
+    await proxies[0].client.send_event(StartGameEvent(pid="0"))
+
+    async def wait_for_results():
+        while len(results) < 2:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(wait_for_results(), timeout=60)
+    for task in tasks:
+        task.cancel()
+
+    expected = run_game("classic", ["rank_conv", "rank_conv"], seed)
+    assert results == [expected.result, expected.result]
+    # every player observes every turn, and waits for action on its own turns
+    for turns in observed.values():
+        assert [turn for turn in turns if turn] == list(range(1, expected.turns + 1))
+    assert observed["0"].count(0) + observed["1"].count(0) == expected.turns
+
+
+def test_resync_request_before_delta_is_ignored(caplog):
+    actor = ServerPlayerActor("0", AsyncServer("127.0.0.1", get_free_port()), delta_updates=True)
+    assert not asyncio.run(actor.resync_request_handler(ResyncRequestEvent(pid="0")))
+    assert "asked to resync before any delta update" in caplog.text
+    assert asyncio.run(actor.resync_request_handler(ResyncRequestEvent(pid="1")))
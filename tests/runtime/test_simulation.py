@@ -0,0 +1,21 @@
+from hanapy.core.config import GameResult
+from hanapy.runtime.simulation import SimulationStats, simulate
+
+
+def test_simulation_stats():
+    stats = SimulationStats()
+    for score in [10, 20, 25]:
+        stats.add(GameResult(is_win=score == 25, score=score, max_score=25))
+
+    assert stats.games == 3
+    assert stats.mean == 55 / 3
+    assert round(stats.stddev, 6) == 7.637626
+    assert stats.win_rate == 1 / 3
+
+
+def test_simulate_is_reproducible():
+    first = list(simulate("classic", ["simple", "simple"], range(3)))
+    second = list(simulate("classic", ["simple", "simple"], range(3)))
+
+    assert [r.seed for r in first] == [0, 1, 2]
+    assert first == second
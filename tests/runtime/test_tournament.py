@@ -0,0 +1,40 @@
+from hanapy.runtime.tournament import Matchup, Tournament, get_matchups
+
+
+def test_get_matchups():
+    matchups = get_matchups(["classic"], ["a", "b"], [2, 3])
+    assert [m.bots for m in matchups] == [
+        ("a", "a"),
+        ("a", "b"),
+        ("b", "b"),
+        ("a", "a", "a"),
+        ("a", "a", "b"),
+        ("a", "b", "b"),
+        ("b", "b", "b"),
+    ]
+
+
+def test_tournament_resume(tmp_path):
+    checkpoint = str(tmp_path / "results.jsonl")
+    matchups = get_matchups(["classic"], ["simple", "simple_log"], [2])[:2]
+
+    first = Tournament(matchups, range(2), checkpoint=checkpoint).run()
+    assert len(first) == 4
+    with open(checkpoint, "ab") as f:
+        f.write(b'{"matchup":')
+
+    played = []
+    resumed = Tournament(matchups, range(3), checkpoint=checkpoint)
+    results = resumed.run(callback=played.append)
+    assert [(r.matchup, r.seed) for r in played] == [(m, 2) for m in matchups]
+    assert results[:4] == first
+    with open(checkpoint, "rb") as f:
+        assert len(f.read().splitlines()) == 6
+
+    stats = resumed.get_stats()
+    assert all(s.games == 3 for s in stats.values())
+    # common seeds: both matchups play the same bot logic, so same decks give the same scores
+    by_seed = {(r.matchup, r.seed): r.result for r in results}
+    assert matchups[1] == Matchup("classic", ("simple", "simple_log"))
+    assert all(by_seed[(matchups[0], seed)] == by_seed[(matchups[1], seed)] for seed in range(3))
+    assert "simple,simple" in resumed.get_table()
@@ -0,0 +1,66 @@
+import asyncio
+import socket
+
+import pytest
+
+from hanapy.runtime.asyncio import AsyncClient, AsyncServer
+from hanapy.runtime.events import ActionVerificationEvent, MessageEvent
+from hanapy.runtime.wire import JSON, MSGPACK, WIRE_FORMATS, negotiate
+
+
+@pytest.mark.parametrize("name", [JSON, MSGPACK])
+def test_frames(name):
+    asyncio.run(_frames(name))
+
+
+async def _frames(name):
+    wire_format = WIRE_FORMATS[name]
+    events = [MessageEvent(pid="a", text="line\nbreak"), ActionVerificationEvent(pid="b", success=True, msg="")]
+    reader = asyncio.StreamReader()
+    for event in events:
+        reader.feed_data(wire_format.encode(event))
+    reader.feed_eof()
+
+    for event in events:
+        data = await wire_format.read(reader)
+        assert data is not None
+        assert wire_format.decode(data) == event
+    assert await wire_format.read(reader) is None
+
+
+def test_negotiate():
+    assert negotiate([MSGPACK, JSON]).name == MSGPACK
+    assert negotiate(["unknown", JSON]).name == JSON
+    assert negotiate([]).name == JSON
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.mark.parametrize("formats", [(MSGPACK, JSON), (JSON,), ("unknown",)])
+def test_client_server(formats):
+    asyncio.run(_client_server(formats))
+
+
+async def _client_server(formats):
+    port = get_free_port()
+    server = AsyncServer("127.0.0.1", port)
+    server_task = asyncio.create_task(server.run())
+    client = AsyncClient("127.0.0.1", port, wire_formats=formats)
+    try:
+        await client.connect()
+        assert await client.register("p") == 0
+        expected = negotiate(formats).name
+        assert client.wire_format.name == expected
+        assert [f.name for f in server.wire_formats.values()] == [expected]
+
+        await server.send_event("p", MessageEvent(pid="p", text="hello"))
+        assert (await client.wait_for_event(MessageEvent)).text == "hello"
+        await client.send_event(ActionVerificationEvent(pid="p", success=True, msg="ok"))
+        assert (await server.wait_for_event("p", ActionVerificationEvent)).msg == "ok"
+    finally:
+        client.writer.close()  # type: ignore[union-attr]
+        server_task.cancel()
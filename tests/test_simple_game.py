@@ -1,3 +1,5 @@
+from msgspec import structs
+
 from hanapy.players.dummy import DiscardingPlayer
 from hanapy.variants.classic import ClassicGame
 
@@ -6,7 +8,7 @@ async def test_classic_game():
     players = [DiscardingPlayer("1"), DiscardingPlayer("1")]
     game = ClassicGame(players, random_seed=0)
     loop = game.get_loop()
-    loop.data.config.unlimited_clues = True
+    loop.data.config = structs.replace(loop.data.config, unlimited_clues=True)
     await loop.run()
 
     assert loop.data.deck.is_empty()
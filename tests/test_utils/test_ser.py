@@ -87,3 +87,32 @@ def test_ser_memo_cell():
     data = dumps(cell)
     assert json.loads(data) == {"__typename__": f"{MyMemoCell.__module__}.{MyMemoCell.__name__}", "field": "asd"}
     assert loads(MemoCell, data) == cell
+
+
+def test_defaults():
+    class WithDefaults(A):
+        __typename__: ClassVar = "with_defaults"
+        f2: int = 1
+        f3: Dict[str, int] = msgspec.field(default_factory=dict)
+
+    a = WithDefaults(f1="f1")
+    assert a.f2 == 1
+    assert a.f3 == {}
+    assert a.f3 is not WithDefaults(f1="f1").f3
+    assert json.loads(dumps(a)) == {"__typename__": "with_defaults", "f1": "f1", "f2": 1, "f3": {}}
+    assert loads(A, dumps(a)) == a
+    assert dumps(a, msgspec.msgpack) == msgspec.msgpack.encode(json.loads(dumps(a)))
+
+
+def test_loads_subclass_registered_later():
+    b = B(f1="f1", f2="f2")
+    assert loads(A, dumps(b)) == b
+
+    class Later(A):
+        __typename__: ClassVar = "later"
+        f4: int
+
+    later = Later(f1="f1", f4=4)
+    assert loads(A, dumps(later)) == later
+    assert loads(A, dumps(later, msgspec.msgpack), msgspec.msgpack) == later
+    assert loads(Later, dumps(later)) == later
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from hanapy.runtime.simulation import run_game
+from hanapy.utils.seeds import derive_seed, seed_stream
+from hanapy.variants.classic import ClassicDeckGenerator
+from hanapy.variants.smol import SmolGame
+from tests.contrib.conftest import Games, Players
+
+
+def test_deck_generator_does_not_use_global_random():
+    config = Games.classic(2).get_card_config()
+    random.seed(1)
+    expected = random.random()  # noqa: S311
+    random.seed(1)
+    deck = ClassicDeckGenerator(5).generate(config)
+    assert random.random() == expected  # noqa: S311
+    assert ClassicDeckGenerator(5).generate(config) == deck
+    assert ClassicDeckGenerator(6).generate(config) != deck
+
+
+def test_seed_streams():
+    assert derive_seed(1, "bot", 0) == derive_seed(1, "bot", 0)
+    assert derive_seed(1, "bot", 0) != derive_seed(1, "bot", 1)
+    assert seed_stream(3, "x").random() == seed_stream(3, "x").random()
+
+
+@pytest.mark.parametrize("variant", ["smol2x2", "smol1x2"])
+@pytest.mark.parametrize("players", [2, 3])
+def test_smol_games(variant, players):
+    result = run_game(variant, ["simple"] * players, 1)
+    assert result.result.max_score == {"smol2x2": 4, "smol1x2": 2}[variant]
+    assert run_game(variant, ["simple"] * players, 1) == result
+
+
+def test_smol_deck_too_small():
+    game = SmolGame(Players.discarding(2), 1, 1, random_seed=1)
+    with pytest.raises(ValueError):
+        game.get_loop()